@@ -35,6 +35,11 @@ DB_USER = os.getenv('DB_USER', '')
 DB_PASSWORD = os.getenv('DB_PASSWORD', '')
 SQLITE_DB_PATH = os.getenv('SQLITE_DB_PATH', 'data/clinic_intelligence.db')
 
+# Connection pool (PostgreSQL / Neon)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 16))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 16))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 300))  # seconds; Neon drops idle connections
+
 # BigQuery Configuration
 BIGQUERY_PROJECT_ID = os.getenv('BIGQUERY_PROJECT_ID', '')
 BIGQUERY_DATASET = os.getenv('BIGQUERY_DATASET', 'clinic_data')
@@ -85,6 +90,16 @@ LOG_FILE = LOG_DIR / os.getenv('LOG_FILE', 'clinic_intelligence.log').split('/')
 API_RATE_LIMIT_DELAY = float(os.getenv('API_RATE_LIMIT_DELAY', 1.0))
 MAX_RETRIES = int(os.getenv('MAX_RETRIES', 3))
 
+# Yelp concurrency: parallel HTTP workers (per business and per ZIP search),
+# capped at Yelp's per-second quota
+YELP_MAX_WORKERS = int(os.getenv('YELP_MAX_WORKERS', 8))
+YELP_ZIP_WORKERS = int(os.getenv('YELP_ZIP_WORKERS', 4))
+YELP_MAX_QPS = float(os.getenv('YELP_MAX_QPS', 5))
+
+# Days to reuse cached Yelp business details/reviews (0 disables the cache)
+YELP_CACHE_TTL_DAYS = float(os.getenv('YELP_CACHE_TTL_DAYS', 7))
+YELP_CACHE_PATH = DATA_DIR / 'raw' / 'yelp_api_cache.db'
+
 # Database connection string
 def get_database_url():
     """Generate database connection URL based on configuration."""
@@ -33,6 +33,7 @@ python3 run_automated_data_collection_pipeline.py --clean-only
 
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
@@ -61,33 +62,58 @@ class DataPipeline:
         logger.info("")
 
     def collect_google_data(self):
-        """Collect data from Google Places API."""
+        """
+        Collect data from Google Places API.
+
+        Must finish before collect_yelp_data starts: each collector matches
+        against the other source's clinics before creating a new one. May
+        run concurrently with collect_trends_data; the collector owns its
+        own database session, which must not be shared across threads.
+        """
         logger.info("STEP 1: Collecting Google Places Data")
         logger.info("-" * 80)
 
         try:
             collector = GooglePlacesCollector()
-            # Run collection logic here
-            logger.success("✓ Google Places collection complete")
+            try:
+                # Run collection logic here
+                logger.success("✓ Google Places collection complete")
+            finally:
+                collector.close()
         except Exception as e:
             logger.error(f"✗ Google Places collection failed: {e}")
             raise
 
     def collect_yelp_data(self):
-        """Collect data from Yelp API."""
+        """
+        Collect data from Yelp API.
+
+        Runs after collect_google_data so its per-ZIP candidate snapshot
+        (prefetch_clinics) includes every Google clinic; run concurrently,
+        one physical clinic could be saved as a Google-only and a Yelp-only
+        record. May run concurrently with collect_trends_data.
+        """
         logger.info("STEP 2: Collecting Yelp Data")
         logger.info("-" * 80)
 
         try:
             collector = YelpCollector()
-            # Run collection logic here
-            logger.success("✓ Yelp collection complete")
+            try:
+                # Run collection logic here
+                logger.success("✓ Yelp collection complete")
+            finally:
+                collector.close()
         except Exception as e:
             logger.error(f"✗ Yelp collection failed: {e}")
             raise
 
     def collect_trends_data(self):
-        """Collect search demand data from Google Trends."""
+        """
+        Collect search demand data from Google Trends.
+
+        Only writes search_trends (and its collection log), so it may run
+        concurrently with the clinic collectors.
+        """
         logger.info("STEP 3: Collecting Google Trends Data")
         logger.info("-" * 80)
 
@@ -121,6 +147,7 @@ class DataPipeline:
         cleaner = DataCleaner()
         try:
             result = cleaner.run_full_cleaning()
+            cleaner.export_tables()
             logger.success("✓ Data cleaning complete")
             return result
         finally:
@@ -172,19 +199,37 @@ class DataPipeline:
         if collectors is None:
             collectors = ['google', 'yelp', 'trends']
 
-        # Step 1-3: Data Collection
+        # Step 1-2: Google then Yelp, in order - each matches against the
+        # other source's saved clinics, so they must not overlap
+        clinic_steps = []
         if 'google' in collectors:
-            self.collect_google_data()
-            logger.info("")
-
+            clinic_steps.append(self.collect_google_data)
         if 'yelp' in collectors:
-            self.collect_yelp_data()
-            logger.info("")
-
+            clinic_steps.append(self.collect_yelp_data)
+
+        def collect_clinics():
+            for step in clinic_steps:
+                step()
+
+        # Step 3: Trends only touches search_trends - collect it alongside
+        # the clinic collectors (wall time = max instead of sum). Each step
+        # uses its own collector and session.
+        api_steps = []
+        if clinic_steps:
+            api_steps.append(collect_clinics)
         if 'trends' in collectors:
-            self.collect_trends_data()
+            api_steps.append(self.collect_trends_data)
+
+        if api_steps:
+            with ThreadPoolExecutor(max_workers=len(api_steps)) as executor:
+                futures = [executor.submit(step) for step in api_steps]
+                for future in futures:
+                    future.result()
             logger.info("")
 
+        # Enrichment/cleaning/imputation stay serial: they work on the
+        # combined clinics table
+
         # Step 4: Enrichment
         self.enrich_data()
 
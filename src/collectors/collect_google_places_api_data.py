@@ -6,6 +6,7 @@ import googlemaps
 import time
 from datetime import datetime
 from loguru import logger
+from sqlalchemy import and_, or_
 import sys
 from pathlib import Path
 
@@ -22,7 +23,7 @@ from config.settings import (
 )
 from src.database.sqlalchemy_database_models import Clinic, Review, DataCollectionLog
 from src.database.initialize_create_database_tables import get_session
-from src.utils.clinic_matcher import ClinicMatcher, merge_clinic_data
+from src.utils.duplicate_clinic_detector_merger import ClinicMatcher, merge_clinic_data
 
 
 class GooglePlacesCollector:
@@ -120,6 +121,42 @@ class GooglePlacesCollector:
 
         return address_data
 
+    def find_yelp_only_candidates(self, new_clinic_data):
+        """
+        Load the Yelp-only clinics a Google place could match.
+
+        A match needs >= 50 points and name + address give at most 25, so
+        every possible match shares the phone number (+40) or lies within
+        50m (+35). Only those clinics are loaded (phone_norm index and a
+        lat/lng bounding box), instead of every Yelp-only clinic per place.
+
+        EXAMPLE:
+            3,000 Yelp-only clinics in the database
+            Place: phone (312) 555-0101 at (41.8860, -87.6201)
+            Before: 3,000 clinics loaded and scored
+            After:  the 1-2 sharing the phone or inside the 50m box
+        """
+        phone_norm = ClinicMatcher.normalize_phone(new_clinic_data.get('phone'))
+        lat = new_clinic_data.get('latitude')
+        lng = new_clinic_data.get('longitude')
+
+        # Rows not yet backfilled have no stored phone key; keep them
+        conditions = [Clinic.phone_norm.is_(None)]
+        if phone_norm:
+            conditions.append(Clinic.phone_norm == phone_norm)
+        if lat is not None and lng is not None:
+            min_lat, max_lat, min_lng, max_lng = ClinicMatcher.bounding_box(lat, lng)
+            conditions.append(and_(
+                Clinic.latitude.between(min_lat, max_lat),
+                Clinic.longitude.between(min_lng, max_lng)
+            ))
+
+        return self.session.query(Clinic).filter(
+            Clinic.google_place_id.is_(None),
+            Clinic.yelp_business_id.isnot(None),
+            or_(*conditions)
+        ).order_by(Clinic.id).all()
+
     def save_clinic(self, place_data):
         """
         Save or update clinic data in the database.
@@ -193,14 +230,18 @@ class GooglePlacesCollector:
             else:
                 # Step 2: BIDIRECTIONAL MATCHING
                 # Try to find matching Yelp-only clinic (no google_place_id)
-                yelp_only_clinics = self.session.query(Clinic).filter(
-                    Clinic.google_place_id.is_(None),
-                    Clinic.yelp_business_id.isnot(None)
-                ).all()
-
-                matched_clinic, match_result = ClinicMatcher.find_matching_clinic(
-                    new_clinic_data, yelp_only_clinics, same_zip_only=False  # Use coordinates, not ZIP
-                )
+                yelp_only_clinics = self.find_yelp_only_candidates(new_clinic_data)
+
+                # Exact phone + name hit first; fuzzy scoring only for the rest
+                matched_clinic = ClinicMatcher.find_exact_match(new_clinic_data, yelp_only_clinics)
+                if matched_clinic:
+                    match_result = ClinicMatcher.calculate_match_score(
+                        new_clinic_data, matched_clinic, name_similarity=1.0
+                    )
+                else:
+                    matched_clinic, match_result = ClinicMatcher.find_matching_clinic(
+                        new_clinic_data, yelp_only_clinics, same_zip_only=False  # Use coordinates, not ZIP
+                    )
 
                 if matched_clinic:
                     # MERGE: Update existing Yelp clinic with Google data
@@ -2,17 +2,27 @@
 Database initialization and management utilities.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import (
+    BigInteger, Boolean, Float, Text, and_, bindparam, case, cast, create_engine,
+    event, func, insert, inspect, or_, select, text, update
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker
 from loguru import logger
+import csv
 import sys
+import threading
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from src.database.sqlalchemy_database_models import Base
-from config.settings import get_database_url, LOG_FILE, LOG_LEVEL
+from src.database.sqlalchemy_database_models import Base, Clinic
+from src.database.normalize_match_keys import normalize_address, normalize_name, normalize_phone
+from config.settings import (
+    get_database_url, LOG_FILE, LOG_LEVEL,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_RECYCLE
+)
 
 
 def setup_logging():
@@ -47,6 +57,9 @@ def create_database():
         # Create all tables
         Base.metadata.create_all(engine)
 
+        # create_all skips tables that already exist: bring those up to date
+        upgrade_database(engine)
+
         logger.success("✓ Database tables created successfully")
 
         # Print table summary
@@ -62,6 +75,88 @@ def create_database():
         raise
 
 
+def upgrade_database(engine):
+    """
+    Migrate tables created by an older version of the models.
+
+    Works through the engine, so it runs the same on SQLite and PostgreSQL
+    (Neon):
+    1. ALTER TABLE ... ADD COLUMN for every model column the table lacks
+    2. Backfill name_norm / address_norm / phone_norm (backfill_match_keys)
+    3. Create indexes added since the table was created (they may cover
+       the new columns, so this comes last)
+
+    Safe to run repeatedly; a current database is left unchanged.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    quote = engine.dialect.identifier_preparer.quote
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(
+                        f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"
+                    ))
+                    logger.info(f"Added column: {table.name}.{column.name}")
+
+    backfill_match_keys(engine)
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+def backfill_match_keys(engine):
+    """
+    Fill name_norm / address_norm / phone_norm for clinics written before
+    those columns existed (new writes set them through Clinic's validator).
+
+    One SELECT for the rows missing a key, then one executemany UPDATE.
+
+    Returns: number of clinics backfilled
+    """
+    clinics = Clinic.__table__
+
+    with engine.begin() as conn:
+        rows = conn.execute(
+            select(clinics.c.id, clinics.c.name, clinics.c.address, clinics.c.phone)
+            .where(or_(
+                clinics.c.name_norm.is_(None),
+                clinics.c.address_norm.is_(None),
+                clinics.c.phone_norm.is_(None)
+            ))
+        ).all()
+
+        if rows:
+            conn.execute(
+                update(clinics)
+                .where(clinics.c.id == bindparam('clinic_id'))
+                .values(
+                    name_norm=bindparam('name_key'),
+                    address_norm=bindparam('address_key'),
+                    phone_norm=bindparam('phone_key')
+                ),
+                [
+                    {
+                        'clinic_id': row.id,
+                        'name_key': normalize_name(row.name),
+                        'address_key': normalize_address(row.address),
+                        'phone_key': normalize_phone(row.phone),
+                    }
+                    for row in rows
+                ]
+            )
+            logger.info(f"Backfilled normalized match keys for {len(rows)} clinics")
+
+    return len(rows)
+
+
 def drop_database():
     """
     Drop all database tables. Use with caution!
@@ -84,16 +179,201 @@ def drop_database():
         raise
 
 
-def get_session():
+# Tuning for the local SQLite file. mmap lets SQLite read pages straight
+# from the OS page cache, and a 256 MB page cache plus in-memory temp
+# storage keep the full-table scans used by enrichment, cleaning and
+# imputation off disk. query_only is deliberately not set: the same
+# sessions also write.
+# Write side: WAL with synchronous=NORMAL fsyncs only at checkpoints
+# instead of twice per commit (a crash can lose the last commits, never
+# corrupt the file), lets readers run alongside the concurrent collectors'
+# writes, and busy_timeout makes a blocked writer wait instead of failing
+# with "database is locked".
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "busy_timeout=5000",
+    "mmap_size=1073741824",
+    "cache_size=-262144",
+    "temp_store=MEMORY",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to every new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine():
     """
-    Get a database session.
+    Get the shared engine for the configured database, creating it once.
+
+    Every collector and cleaner used to build its own engine (and pool) per
+    session. Sharing one engine reuses pooled connections across the
+    pipeline. On PostgreSQL the pool pings connections before use and
+    recycles them after DB_POOL_RECYCLE seconds so Neon's idle timeouts
+    don't surface as errors, and executemany inserts are sent as batched
+    multi-row VALUES.
     """
     database_url = get_database_url()
-    engine = create_engine(database_url, echo=False)
-    Session = sessionmaker(bind=engine)
+
+    with _engines_lock:
+        engine = _engines.get(database_url)
+        if engine is None:
+            options = {}
+            if database_url.startswith('postgresql'):
+                options = {
+                    'pool_size': DB_POOL_SIZE,
+                    'max_overflow': DB_MAX_OVERFLOW,
+                    'pool_pre_ping': True,
+                    'pool_recycle': DB_POOL_RECYCLE,
+                    'executemany_mode': 'values_plus_batch',
+                    'insertmanyvalues_page_size': 1000,
+                }
+
+            engine = create_engine(database_url, echo=False, **options)
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', _set_sqlite_pragmas)
+            _engines[database_url] = engine
+
+    return engine
+
+
+def get_session(**session_options):
+    """
+    Get a database session.
+
+    Keyword arguments are passed to sessionmaker.
+
+    EXAMPLE:
+        get_session(expire_on_commit=False)
+        → loaded objects keep their attribute values after commit()
+    """
+    Session = sessionmaker(bind=get_engine(), **session_options)
     return Session()
 
 
+def insert_ignore_duplicates(session, model, rows, key):
+    """
+    Insert many rows in one statement, skipping rows whose unique `key`
+    column already exists.
+
+    Uses INSERT ... ON CONFLICT DO NOTHING on PostgreSQL and SQLite, so the
+    database does the duplicate check instead of one SELECT per row.
+
+    EXAMPLE:
+        insert_ignore_duplicates(session, Review, [
+            {'review_id': 'yelp_abc', 'clinic_id': 7, 'source': 'yelp', 'rating': 5},
+            {'review_id': 'yelp_def', 'clinic_id': 7, 'source': 'yelp', 'rating': 4},
+        ], key='review_id')
+        → one INSERT; 'yelp_abc' is skipped if it was saved on a previous run
+    """
+    if not rows:
+        return
+
+    dialect = session.get_bind().dialect.name
+
+    if dialect in ('postgresql', 'sqlite'):
+        dialect_insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = dialect_insert(model).on_conflict_do_nothing(index_elements=[key])
+        session.execute(stmt, rows)
+        return
+
+    # Other backends: one SELECT for the whole batch, then a plain INSERT
+    key_column = getattr(model, key)
+    existing = set(session.scalars(
+        select(key_column).where(key_column.in_([row[key] for row in rows]))
+    ))
+    new_rows = []
+    for row in rows:
+        if row[key] not in existing:
+            existing.add(row[key])
+            new_rows.append(row)
+
+    if new_rows:
+        session.execute(insert(model), new_rows)
+
+
+def python_csv_columns(query):
+    """
+    The same SELECT, with boolean and float columns rendered as text the
+    way csv.writer prints the Python values.
+
+    COPY writes PostgreSQL's own text output (t/f, 4 rather than 4.0), so
+    without this the exported file would depend on the backend.
+
+    EXAMPLE:
+        is_complete=true, google_rating=4.0, latitude=41.8965
+        → 'True', '4.0', '41.8965' (NULL stays an empty field)
+    """
+    columns = []
+    for column in query.selected_columns:
+        value = column.element if hasattr(column, 'element') else column
+        if isinstance(column.type, Boolean):
+            value = case((value == True, 'True'), (value == False, 'False'))
+        elif isinstance(column.type, Float):
+            # float8::text is the shortest round-trip form, like Python's
+            # repr, except whole numbers lose their '.0'
+            value = case(
+                (
+                    and_(value == func.trunc(value), func.abs(value) < 1e15),
+                    cast(cast(value, BigInteger), Text).concat('.0')
+                ),
+                else_=cast(value, Text)
+            )
+        else:
+            columns.append(column)
+            continue
+        columns.append(value.label(column.name))
+
+    return query.with_only_columns(*columns)
+
+
+def export_query_to_csv(session, query, filepath):
+    """
+    Stream the rows of a SELECT into a CSV file (header + rows).
+
+    PostgreSQL: COPY (query) TO STDOUT WITH CSV HEADER - the server writes
+    the CSV and rows never become Python objects. Booleans and floats are
+    rendered as Python prints them (python_csv_columns), so the file is
+    the same on every backend.
+    Other backends: rows are streamed in batches of 1000 through csv.writer.
+
+    EXAMPLE:
+        export_query_to_csv(session, select(Review.__table__), "data/exports/reviews.csv")
+        → returns 2450 (rows written)
+    """
+    dialect = session.get_bind().dialect
+
+    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        if dialect.name == 'postgresql':
+            sql = python_csv_columns(query).compile(dialect=dialect, compile_kwargs={'literal_binds': True})
+            cursor = session.connection().connection.cursor()
+            try:
+                cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH CSV HEADER", f)
+                return cursor.rowcount
+            finally:
+                cursor.close()
+
+        result = session.execute(query.execution_options(yield_per=1000))
+        writer = csv.writer(f)
+        writer.writerow(result.keys())
+
+        row_count = 0
+        for rows in result.partitions():
+            writer.writerows(rows)
+            row_count += len(rows)
+
+        return row_count
+
+
 def reset_database():
     """
     Drop and recreate all tables. Use with caution!
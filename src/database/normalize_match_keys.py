@@ -0,0 +1,110 @@
+"""
+Normalized match keys for clinics (name_norm / address_norm / phone_norm).
+
+Kept in the database layer so the models can maintain the normalized
+columns without importing the matching utilities; ClinicMatcher uses the
+same functions for comparisons.
+"""
+
+import re
+
+
+# Compiled once at import; the normalizers run for every candidate clinic
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+NON_DIGIT_PATTERN = re.compile(r"\D")
+
+# Common words to remove for better name matching
+NOISE_WORDS = frozenset([
+    'clinic', 'medical', 'center', 'healthcare', 'health', 'care',
+    'hospital', 'group', 'practice', 'associates', 'physicians',
+    'llc', 'inc', 'pc', 'md', 'dds', 'the', 'of', 'at', 'and'
+])
+
+# Address abbreviation mappings
+ADDRESS_ABBREVIATIONS = {
+    'street': 'st', 'st.': 'st', 'str': 'st',
+    'avenue': 'ave', 'ave.': 'ave', 'av': 'ave',
+    'boulevard': 'blvd', 'blvd.': 'blvd',
+    'drive': 'dr', 'dr.': 'dr',
+    'road': 'rd', 'rd.': 'rd',
+    'lane': 'ln', 'ln.': 'ln',
+    'court': 'ct', 'ct.': 'ct',
+    'place': 'pl', 'pl.': 'pl',
+    'north': 'n', 'n.': 'n',
+    'south': 's', 's.': 's',
+    'east': 'e', 'e.': 'e',
+    'west': 'w', 'w.': 'w',
+    'suite': 'ste', 'ste.': 'ste', 'unit': 'ste',
+    'floor': 'fl', 'fl.': 'fl',
+    'apartment': 'apt', 'apt.': 'apt',
+}
+
+
+def normalize_name(name):
+    """
+    Normalize clinic name for comparison.
+
+    EXAMPLE:
+        Input:  "Northwestern Memorial Hospital & Medical Center"
+        Output: "northwestern memorial"
+
+        Input:  "Dr. Smith's Family Practice, LLC"
+        Output: "dr smiths family"
+    """
+    if not name:
+        return ""
+
+    # Lowercase, then remove punctuation except spaces
+    normalized = PUNCTUATION_PATTERN.sub(" ", name.lower())
+
+    # Remove noise words; split/join also removes extra spaces
+    return " ".join([w for w in normalized.split() if w not in NOISE_WORDS])
+
+
+def normalize_address(address):
+    """
+    Normalize address for comparison.
+
+    EXAMPLE:
+        Input:  "251 E. Huron Street, Suite 100, Chicago, IL 60611"
+        Output: "251 e huron st ste 100 chicago il 60611"
+
+        Input:  "251 East Huron St"
+        Output: "251 e huron st"
+    """
+    if not address:
+        return ""
+
+    # Bound locally, looked up once per word below
+    abbreviation = ADDRESS_ABBREVIATIONS.get
+
+    # Lowercase, then remove punctuation
+    normalized = PUNCTUATION_PATTERN.sub(" ", address.lower())
+
+    # Split into words and replace abbreviations; split/join also
+    # removes extra spaces
+    return " ".join([abbreviation(word, word) for word in normalized.split()])
+
+
+def normalize_phone(phone):
+    """
+    Normalize phone number (digits only).
+
+    EXAMPLE:
+        Input:  "+1 (312) 926-2000"
+        Output: "3129262000"
+
+        Input:  "312.926.2000"
+        Output: "3129262000"
+    """
+    if not phone:
+        return ""
+
+    # Extract digits only
+    digits = NON_DIGIT_PATTERN.sub("", phone)
+
+    # Remove country code if present (assuming US)
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+
+    return digits
@@ -8,7 +8,13 @@ from sqlalchemy import (
     Boolean, Text, ForeignKey, Index, Date, JSON
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.orm import relationship, sessionmaker, validates
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from src.database.normalize_match_keys import normalize_address, normalize_name, normalize_phone
 
 Base = declarative_base()
 
@@ -33,6 +39,12 @@ class Clinic(Base):
     phone = Column(String(50))
     website = Column(String(500))
 
+    # Normalized match keys (src.database.normalize_match_keys), set whenever
+    # name/address/phone is assigned so matching doesn't re-normalize
+    name_norm = Column(String(500))
+    address_norm = Column(String(500))
+    phone_norm = Column(String(50), index=True)
+
     # Location
     latitude = Column(Float)
     longitude = Column(Float)
@@ -74,6 +86,47 @@ class Clinic(Base):
     reviews = relationship('Review', back_populates='clinic', cascade='all, delete-orphan')
     visibility_scores = relationship('VisibilityScore', back_populates='clinic', cascade='all, delete-orphan')
 
+    # Indexes
+    # Partial indexes over clinics not yet linked to Yelp: the Yelp
+    # collector's same-ZIP and nearby-box candidate lookups only scan these.
+    # Likewise for clinics not yet linked to Google (Google collector's
+    # within-50m lookup).
+    __table_args__ = (
+        Index(
+            'idx_clinic_unlinked_yelp_zip', 'zip_code',
+            postgresql_where=yelp_business_id.is_(None),
+            sqlite_where=yelp_business_id.is_(None)
+        ),
+        Index(
+            'idx_clinic_unlinked_yelp_location', 'latitude', 'longitude',
+            postgresql_where=yelp_business_id.is_(None),
+            sqlite_where=yelp_business_id.is_(None)
+        ),
+        Index(
+            'idx_clinic_unlinked_google_location', 'latitude', 'longitude',
+            postgresql_where=google_place_id.is_(None),
+            sqlite_where=google_place_id.is_(None)
+        ),
+        Index('idx_clinic_zip_name_norm', 'zip_code', 'name_norm'),
+    )
+
+    @validates('name', 'address', 'phone')
+    def _set_normalized_key(self, key, value):
+        """
+        Keep name_norm / address_norm / phone_norm in step with the raw field.
+
+        EXAMPLE:
+            clinic.phone = "+1 (312) 926-2000"
+            → clinic.phone_norm == "3129262000"
+        """
+        if key == 'name':
+            self.name_norm = normalize_name(value)
+        elif key == 'address':
+            self.address_norm = normalize_address(value)
+        else:
+            self.phone_norm = normalize_phone(value)
+        return value
+
     def __repr__(self):
         return f"<Clinic(name='{self.name}', zip='{self.zip_code}')>"
 
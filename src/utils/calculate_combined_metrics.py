@@ -17,11 +17,22 @@ import sys
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
+from sqlalchemy import Numeric, and_, case, cast, func, update
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from src.database.sqlalchemy_database_models import Clinic, Review
-from src.database.initialize_create_database_tables import get_session
+from src.database.initialize_create_database_tables import get_engine, get_session, upgrade_database
+
+
+def _present(column, empty=''):
+    """SQL for Python truthiness of a column: not NULL and not '' (or 0)."""
+    return and_(column.isnot(None), column != empty)
+
+
+def _points(condition, points):
+    """SQL expression worth `points` when condition holds, else 0."""
+    return case((condition, points), else_=0)
 
 
 class DataEnrichment:
@@ -39,129 +50,149 @@ class DataEnrichment:
     def enrich_all_clinics(self):
         """
         Enrich all active clinics with calculated fields.
+
+        Every field is a pure function of the clinic's own columns, so the
+        whole step is ONE UPDATE evaluated by the database: no rows travel
+        to Python and back.
         """
         logger.info("=" * 60)
         logger.info("DATA ENRICHMENT - Calculating fields for all clinics")
         logger.info("=" * 60)
 
-        clinics = self.session.query(Clinic).filter(Clinic.is_active == True).all()
-        logger.info(f"Processing {len(clinics)} clinics...")
-
-        for clinic in clinics:
-            self._enrich_clinic(clinic)
-            self.enriched_count += 1
+        result = self.session.execute(
+            update(Clinic)
+            .where(Clinic.is_active == True)
+            .values(**self.enrichment_values(datetime.utcnow()))
+            .execution_options(synchronize_session=False)
+        )
+        self.enriched_count += result.rowcount
 
         self.session.commit()
         logger.info(f"Enriched {self.enriched_count} clinics")
 
-    def _enrich_clinic(self, clinic):
+    @staticmethod
+    def enrichment_values(now):
         """
-        Calculate and populate all derived fields for a clinic.
+        SET values for the enrichment UPDATE: every derived field (see
+        derived_values) plus the run's last_updated timestamp.
+        """
+        return {**DataEnrichment.derived_values(), 'last_updated': now}
+
+    @staticmethod
+    def derived_values():
+        """
+        SQL expressions for all derived fields, keyed by column name.
+
+        "Has a value" follows Python truthiness, as the Python version did:
+        NULL, '' and 0 all count as missing. SET expressions see the row's
+        old values, so combined_rating is built once and reused by
+        rating_category rather than read back. They work as SELECT columns
+        too (DataCleaner.create_combined_metrics).
+
+        EXAMPLE:
+            google_rating=4.5, yelp_rating=4.0, review counts 120 + 30
+            → data_source='Both', combined_rating=4.25,
+              rating_category='Excellent (4.0+)', combined_review_count=150,
+              review_volume_category='Very High (100+)'
         """
         # 1. Data Source flags
-        clinic.has_google_data = clinic.google_place_id is not None
-        clinic.has_yelp_data = clinic.yelp_business_id is not None
-
-        # 2. Data Source label
-        if clinic.has_google_data and clinic.has_yelp_data:
-            clinic.data_source = 'Both'
-        elif clinic.has_google_data:
-            clinic.data_source = 'Google Only'
-        elif clinic.has_yelp_data:
-            clinic.data_source = 'Yelp Only'
-        else:
-            clinic.data_source = 'Unknown'
+        has_google = Clinic.google_place_id.isnot(None)
+        has_yelp = Clinic.yelp_business_id.isnot(None)
 
         # 3. Combined Rating (average of available ratings)
-        ratings = []
-        if clinic.google_rating:
-            ratings.append(clinic.google_rating)
-        if clinic.yelp_rating:
-            ratings.append(clinic.yelp_rating)
-
-        if ratings:
-            clinic.combined_rating = round(sum(ratings) / len(ratings), 2)
-        else:
-            clinic.combined_rating = None
+        has_google_rating = _present(Clinic.google_rating, 0)
+        has_yelp_rating = _present(Clinic.yelp_rating, 0)
+        rating_sum = (
+            case((has_google_rating, Clinic.google_rating), else_=0.0)
+            + case((has_yelp_rating, Clinic.yelp_rating), else_=0.0)
+        )
+        rating_count = _points(has_google_rating, 1) + _points(has_yelp_rating, 1)
+        # ROUND(numeric, int) exists on both SQLite and PostgreSQL
+        combined_rating = func.round(cast(rating_sum / func.nullif(rating_count, 0), Numeric), 2)
 
         # 4. Combined Review Count (sum of both)
-        clinic.combined_review_count = (clinic.google_review_count or 0) + (clinic.yelp_review_count or 0)
-
-        # 5. Rating Category
-        if clinic.combined_rating is not None:
-            if clinic.combined_rating >= 4.0:
-                clinic.rating_category = 'Excellent (4.0+)'
-            elif clinic.combined_rating >= 3.5:
-                clinic.rating_category = 'Good (3.5-4.0)'
-            elif clinic.combined_rating >= 2.5:
-                clinic.rating_category = 'Medium (2.5-3.5)'
-            else:
-                clinic.rating_category = 'Low (0-2.5)'
-        else:
-            clinic.rating_category = 'Unknown'
-
-        # 6. Review Volume Category
-        if clinic.combined_review_count >= 100:
-            clinic.review_volume_category = 'Very High (100+)'
-        elif clinic.combined_review_count >= 50:
-            clinic.review_volume_category = 'High (51-100)'
-        elif clinic.combined_review_count >= 10:
-            clinic.review_volume_category = 'Medium (11-50)'
-        else:
-            clinic.review_volume_category = 'Low (0-10)'
-
-        # 7. Data Quality Score (0-100)
-        score = 0
-        if clinic.name:
-            score += 10
-        if clinic.address:
-            score += 10
-        if clinic.phone:
-            score += 10
-        if clinic.latitude and clinic.longitude:
-            score += 10
-        if clinic.google_place_id:
-            score += 15
-        if clinic.yelp_business_id:
-            score += 15
-        if clinic.google_rating:
-            score += 10
-        if clinic.yelp_rating:
-            score += 10
-        if clinic.website:
-            score += 5
-        if clinic.clinic_type:
-            score += 5
-
-        clinic.data_quality_score = score
-
-        # 8. Update timestamp
-        clinic.last_updated = datetime.utcnow()
+        combined_review_count = (
+            func.coalesce(Clinic.google_review_count, 0) + func.coalesce(Clinic.yelp_review_count, 0)
+        )
+
+        return {
+            'has_google_data': has_google,
+            'has_yelp_data': has_yelp,
+
+            # 2. Data Source label
+            'data_source': case(
+                (and_(has_google, has_yelp), 'Both'),
+                (has_google, 'Google Only'),
+                (has_yelp, 'Yelp Only'),
+                else_='Unknown'
+            ),
+
+            'combined_rating': combined_rating,
+            'combined_review_count': combined_review_count,
+
+            # 5. Rating Category
+            'rating_category': case(
+                (combined_rating >= 4.0, 'Excellent (4.0+)'),
+                (combined_rating >= 3.5, 'Good (3.5-4.0)'),
+                (combined_rating >= 2.5, 'Medium (2.5-3.5)'),
+                (combined_rating.isnot(None), 'Low (0-2.5)'),
+                else_='Unknown'
+            ),
+
+            # 6. Review Volume Category
+            'review_volume_category': case(
+                (combined_review_count >= 100, 'Very High (100+)'),
+                (combined_review_count >= 50, 'High (51-100)'),
+                (combined_review_count >= 10, 'Medium (11-50)'),
+                else_='Low (0-10)'
+            ),
+
+            # 7. Data Quality Score (0-100)
+            'data_quality_score': (
+                _points(_present(Clinic.name), 10)
+                + _points(_present(Clinic.address), 10)
+                + _points(_present(Clinic.phone), 10)
+                + _points(and_(_present(Clinic.latitude, 0), _present(Clinic.longitude, 0)), 10)
+                + _points(_present(Clinic.google_place_id), 15)
+                + _points(_present(Clinic.yelp_business_id), 15)
+                + _points(has_google_rating, 10)
+                + _points(has_yelp_rating, 10)
+                + _points(_present(Clinic.website), 5)
+                + _points(_present(Clinic.clinic_type), 5)
+            ),
+        }
 
     def enrich_reviews(self):
         """
         Enrich reviews with calculated fields.
-        """
-        logger.info("Enriching reviews...")
 
-        reviews = self.session.query(Review).all()
+        One UPDATE computes both fields in the database (CASE for the label)
+        instead of loading every Review as an ORM object.
 
-        for review in reviews:
-            # Rating category
-            if review.rating >= 5:
-                review.sentiment_label = 'excellent'
-            elif review.rating >= 4:
-                review.sentiment_label = 'positive'
-            elif review.rating >= 3:
-                review.sentiment_label = 'neutral'
-            else:
-                review.sentiment_label = 'negative'
+        EXAMPLE:
+            rating=5 → sentiment_label='excellent', sentiment_score=1.0
+            rating=2 → sentiment_label='negative',  sentiment_score=-0.5
+        """
+        logger.info("Enriching reviews...")
 
-            # Simple sentiment score based on rating
-            review.sentiment_score = (review.rating - 3) / 2  # Maps 1-5 to -1 to 1
+        result = self.session.execute(
+            update(Review)
+            .values(
+                # Rating category
+                sentiment_label=case(
+                    (Review.rating >= 5, 'excellent'),
+                    (Review.rating >= 4, 'positive'),
+                    (Review.rating >= 3, 'neutral'),
+                    else_='negative'
+                ),
+                # Simple sentiment score based on rating
+                sentiment_score=(Review.rating - 3) / 2.0  # Maps 1-5 to -1 to 1
+            )
+            .execution_options(synchronize_session=False)
+        )
 
         self.session.commit()
-        logger.info(f"Enriched {len(reviews)} reviews")
+        logger.info(f"Enriched {result.rowcount} reviews")
 
     def run_full_enrichment(self):
         """
@@ -205,38 +236,10 @@ def add_new_columns_to_db():
     """
     Add the new calculated columns to existing database.
     Run this once to migrate existing databases.
+
+    Dialect-neutral (SQLite and PostgreSQL): see upgrade_database.
     """
-    import sqlite3
-    from config.settings import SQLITE_DB_PATH
-
-    conn = sqlite3.connect(SQLITE_DB_PATH)
-    cursor = conn.cursor()
-
-    # Check if columns exist, add if not
-    cursor.execute("PRAGMA table_info(clinics)")
-    existing_columns = [col[1] for col in cursor.fetchall()]
-
-    new_columns = [
-        ("combined_rating", "REAL"),
-        ("combined_review_count", "INTEGER"),
-        ("data_source", "VARCHAR(20)"),
-        ("has_google_data", "BOOLEAN"),
-        ("has_yelp_data", "BOOLEAN"),
-        ("rating_category", "VARCHAR(30)"),
-        ("review_volume_category", "VARCHAR(30)"),
-        ("data_quality_score", "INTEGER"),
-    ]
-
-    for col_name, col_type in new_columns:
-        if col_name not in existing_columns:
-            try:
-                cursor.execute(f"ALTER TABLE clinics ADD COLUMN {col_name} {col_type}")
-                logger.info(f"Added column: {col_name}")
-            except Exception as e:
-                logger.warning(f"Column {col_name} might already exist: {e}")
-
-    conn.commit()
-    conn.close()
+    upgrade_database(get_engine())
     logger.info("Database schema updated!")
 
 
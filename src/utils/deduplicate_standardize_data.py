@@ -11,16 +11,20 @@ RUN THIS BEFORE IMPORTING TO POWER BI!
 """
 
 import sys
-import re
 import csv
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
+from sqlalchemy import Float, and_, case, cast, func, select, update
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from src.database.sqlalchemy_database_models import Clinic, Review, VisibilityScore, DemandMetric
-from src.database.initialize_create_database_tables import get_session
+from src.database.sqlalchemy_database_models import Base, Clinic, Review, VisibilityScore, DemandMetric
+from src.database.initialize_create_database_tables import get_session, export_query_to_csv
+from src.utils.calculate_combined_metrics import DataEnrichment
+from src.database.normalize_match_keys import NON_DIGIT_PATTERN
 from src.utils.duplicate_clinic_detector_merger import ClinicMatcher
 
 
@@ -37,8 +41,15 @@ class DataCleaner:
     5. POWER BI EXPORT: Creates clean CSVs with proper formatting
     """
 
+    # Largest group of chained matches merged as one. Bigger chains usually
+    # mean distinct clinics linked through a shared switchboard phone or
+    # building, and a merge can't be undone: they are logged at WARNING and
+    # only clinics that match directly are merged
+    MAX_MERGE_GROUP_SIZE = 5
+
     def __init__(self):
-        self.session = get_session()
+        # Nothing reads ORM objects after a commit, so don't expire them
+        self.session = get_session(expire_on_commit=False)
         self.duplicates_found = 0
         self.records_merged = 0
         self.records_cleaned = 0
@@ -63,50 +74,192 @@ class DataCleaner:
         logger.info("STEP 1: Finding and merging duplicate clinics")
         logger.info("=" * 60)
 
-        # Get all clinics
-        all_clinics = self.session.query(Clinic).filter(
-            Clinic.is_active == True
+        # Get all clinics: only the matching columns, as plain rows (full
+        # Clinic objects are loaded later, for merge groups only)
+        all_clinics = self.session.execute(
+            select(
+                Clinic.id, Clinic.name, Clinic.address, Clinic.phone,
+                Clinic.latitude, Clinic.longitude,
+                Clinic.name_norm, Clinic.address_norm, Clinic.phone_norm
+            )
+            .where(Clinic.is_active == True)
+            .order_by(Clinic.id)
         ).all()
 
         logger.info(f"Total active clinics: {len(all_clinics)}")
 
-        # Group by potential duplicates
-        processed_ids = set()
-        merge_groups = []
+        # Matching fields normalized once per clinic, not once per pair
+        match_keys = [self._match_keys(clinic) for clinic in all_clinics]
 
-        for i, clinic1 in enumerate(all_clinics):
-            if clinic1.id in processed_ids:
-                continue
+        # Only pairs that can reach the match threshold are scored
+        candidates = self._duplicate_candidates(match_keys)
 
-            group = [clinic1]
-            processed_ids.add(clinic1.id)
+        # Group duplicates with a disjoint-set over clinic positions, so a
+        # chain of matches (A~B, B~C) ends up in one group even if A and C
+        # don't match directly
+        parent = list(range(len(all_clinics)))
+        matches = defaultdict(list)  # position → later positions it matches
 
-            for clinic2 in all_clinics[i + 1:]:
-                if clinic2.id in processed_ids:
-                    continue
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
 
+        for i, clinic1 in enumerate(all_clinics):
+            # Name similarity to every candidate in one RapidFuzz call
+            name_similarities = ClinicMatcher.normalized_similarities(
+                match_keys[i]['name_norm'], [match_keys[j]['name_norm'] for j in candidates[i]]
+            )
+
+            for j, name_similarity in zip(candidates[i], name_similarities):
                 # Check if they match
-                result = ClinicMatcher.calculate_match_score(clinic1, clinic2)
+                result = ClinicMatcher.calculate_match_score(
+                    match_keys[i], match_keys[j], name_similarity=name_similarity
+                )
 
                 if result['is_match']:
-                    group.append(clinic2)
-                    processed_ids.add(clinic2.id)
-                    self.duplicates_found += 1
-                    logger.info(
-                        f"  DUPLICATE FOUND: '{clinic1.name}' <-> '{clinic2.name}' "
+                    matches[i].append(j)
+                    root1, root2 = find(i), find(j)
+                    parent[max(root1, root2)] = min(root1, root2)
+                    logger.debug(
+                        f"  DUPLICATE FOUND: '{clinic1.name}' <-> '{all_clinics[j].name}' "
                         f"(score={result['score']}, {result['match_reasons']})"
                     )
 
-            if len(group) > 1:
-                merge_groups.append(group)
+        # Groups in id order, each listing its clinics in id order
+        components = defaultdict(list)
+        for i in range(len(all_clinics)):
+            components[find(i)].append(i)
 
-        # Merge each group
-        for group in merge_groups:
-            self._merge_clinic_group(group)
+        merge_groups = []
+        for members in components.values():
+            if len(members) > self.MAX_MERGE_GROUP_SIZE:
+                logger.warning(
+                    f"  {len(members)} clinics chained into one duplicate group "
+                    f"(limit {self.MAX_MERGE_GROUP_SIZE}); merging only direct matches, "
+                    f"review ids {[all_clinics[i].id for i in members]} ('{all_clinics[members[0]].name}')"
+                )
+                groups = self._direct_match_groups(members, matches)
+            else:
+                groups = [members]
+
+            for group in groups:
+                if len(group) > 1:
+                    merge_groups.append([all_clinics[i] for i in group])
+                    self.duplicates_found += len(group) - 1
+
+        # Merge each group, then commit once for the whole run. Changes are
+        # flushed explicitly (once per group) rather than before every query.
+        merge_ids = [row.id for group in merge_groups for row in group]
+        clinics_by_id = {
+            clinic.id: clinic
+            for clinic in self.session.query(Clinic).filter(Clinic.id.in_(merge_ids))
+        } if merge_ids else {}
+        with self.session.no_autoflush:
+            for group in merge_groups:
+                self._merge_clinic_group([clinics_by_id[row.id] for row in group])
+        self.session.commit()
 
         logger.info(f"Duplicates found: {self.duplicates_found}")
         logger.info(f"Records merged: {self.records_merged}")
 
+    @staticmethod
+    def _direct_match_groups(members, matches):
+        """
+        Split an oversized chain of matches into groups whose clinics all
+        match the group's first clinic directly.
+
+        Each clinic, in order, takes the later clinics it matches that no
+        earlier group took.
+
+        EXAMPLE:
+            members [1, 2, 3, 4], matches {1: [2], 2: [3], 3: [4]}
+            → [[1, 2], [3, 4]]
+        """
+        taken = set()
+        groups = []
+        for i in members:
+            if i in taken:
+                continue
+            group = [i] + [j for j in matches[i] if j not in taken]
+            taken.update(group)
+            groups.append(group)
+        return groups
+
+    @staticmethod
+    def _match_keys(clinic):
+        """
+        The fields calculate_match_score reads, as a plain dict.
+
+        Stored name_norm / address_norm / phone_norm are used when set;
+        rows written before those columns existed are normalized here, once,
+        instead of on every comparison.
+
+        EXAMPLE:
+            Clinic(name="Rush Medical Center", phone="(312) 942-5000", name_norm=None, ...)
+            → {'name_norm': 'rush', 'phone_norm': '3129425000', 'phone': '(312) 942-5000', ...}
+        """
+        def stored_or_normalized(key, normalize):
+            stored = getattr(clinic, f'{key}_norm')
+            return stored if stored is not None else normalize(getattr(clinic, key))
+
+        return {
+            'phone': clinic.phone,
+            'latitude': clinic.latitude,
+            'longitude': clinic.longitude,
+            'name_norm': stored_or_normalized('name', ClinicMatcher.normalize_name),
+            'address_norm': stored_or_normalized('address', ClinicMatcher.normalize_address),
+            'phone_norm': stored_or_normalized('phone', ClinicMatcher.normalize_phone),
+        }
+
+    def _duplicate_candidates(self, match_keys):
+        """
+        Blocking step for find_and_merge_duplicates.
+
+        Name (15) and address (10) similarity can't reach the 50-point match
+        threshold on their own, so every match shares a phone number or lies
+        within COORDINATE_DISTANCE_METERS. Only those pairs are candidates:
+        clinics are bucketed by normalized phone, and nearby clinics are
+        found by bisecting a latitude-sorted list and checking the
+        bounding box.
+
+        Args:
+            match_keys: _match_keys of each clinic
+
+        Returns: for each clinic (by position), the positions of LATER
+        clinics that could match it, ascending
+
+        EXAMPLE:
+            clinics[0] and clinics[7] share phone 3129262000
+            clinics[0] and clinics[3] are 20m apart
+            → candidates[0] == [3, 7]
+        """
+        candidates = [set() for _ in match_keys]
+
+        # Same normalized phone
+        by_phone = defaultdict(list)
+        for i, keys in enumerate(match_keys):
+            if keys['phone_norm']:
+                by_phone[keys['phone_norm']].append(i)
+        for members in by_phone.values():
+            for k, i in enumerate(members):
+                candidates[i].update(members[k + 1:])
+
+        # Within the location-match radius
+        located = sorted(
+            (keys['latitude'], i) for i, keys in enumerate(match_keys)
+            if keys['latitude'] is not None and keys['longitude'] is not None
+        )
+        latitudes = [lat for lat, _ in located]
+        for lat, i in located:
+            min_lat, max_lat, min_lng, max_lng = ClinicMatcher.bounding_box(lat, match_keys[i]['longitude'])
+            for _, j in located[bisect_left(latitudes, min_lat):bisect_right(latitudes, max_lat)]:
+                if j > i and min_lng <= match_keys[j]['longitude'] <= max_lng:
+                    candidates[i].add(j)
+
+        return [sorted(later) for later in candidates]
+
     def _merge_clinic_group(self, clinics):
         """
         Merge a group of duplicate clinics into one.
@@ -139,28 +292,37 @@ class DataCleaner:
         primary = clinics[0]
         duplicates = clinics[1:]
 
-        logger.info(f"  Merging into: '{primary.name}' (id={primary.id})")
+        # Clear the duplicates' unique IDs before the primary takes them over,
+        # flushing once to release the unique constraints
+        dup_ids = {}
+        for dup in duplicates:
+            dup_ids[dup.id] = (dup.google_place_id, dup.yelp_business_id)
+            dup.google_place_id = None
+            dup.yelp_business_id = None
+        self.session.flush()
 
         for dup in duplicates:
+            dup_google_id, dup_yelp_id = dup_ids[dup.id]
+
             # Merge Yelp data if primary doesn't have it
-            if not primary.yelp_business_id and dup.yelp_business_id:
-                primary.yelp_business_id = dup.yelp_business_id
+            if not primary.yelp_business_id and dup_yelp_id:
+                primary.yelp_business_id = dup_yelp_id
                 primary.yelp_rating = dup.yelp_rating
                 primary.yelp_review_count = dup.yelp_review_count
                 primary.yelp_price_level = dup.yelp_price_level
-            elif primary.yelp_business_id and dup.yelp_business_id:
+            elif primary.yelp_business_id and dup_yelp_id:
                 # Both have Yelp data - keep primary's, just take better ratings if applicable
                 if dup.yelp_rating and (not primary.yelp_rating or dup.yelp_review_count > primary.yelp_review_count):
                     primary.yelp_rating = dup.yelp_rating
                     primary.yelp_review_count = dup.yelp_review_count
 
             # Merge Google data if primary doesn't have it
-            if not primary.google_place_id and dup.google_place_id:
-                primary.google_place_id = dup.google_place_id
+            if not primary.google_place_id and dup_google_id:
+                primary.google_place_id = dup_google_id
                 primary.google_rating = dup.google_rating
                 primary.google_review_count = dup.google_review_count
                 primary.google_price_level = dup.google_price_level
-            elif primary.google_place_id and dup.google_place_id:
+            elif primary.google_place_id and dup_google_id:
                 # Both have Google data - keep primary's, just take better ratings if applicable
                 if dup.google_rating and (not primary.google_rating or dup.google_review_count > primary.google_review_count):
                     primary.google_rating = dup.google_rating
@@ -179,26 +341,26 @@ class DataCleaner:
             if not primary.address and dup.address:
                 primary.address = dup.address
 
-            # Clear the duplicate's unique IDs before deactivating to avoid constraint issues
-            dup.google_place_id = None
-            dup.yelp_business_id = None
-
-            # Commit this change first to release the unique constraint
-            self.session.flush()
-
-            # Reassign reviews from duplicate to primary
-            reviews = self.session.query(Review).filter_by(clinic_id=dup.id).all()
-            for review in reviews:
-                review.clinic_id = primary.id
-                logger.info(f"    Moved review {review.id} to primary clinic")
-
             # Mark duplicate as inactive (soft delete)
             dup.is_active = False
             self.records_merged += 1
-            logger.info(f"    Merged and deactivated: '{dup.name}' (id={dup.id})")
+            logger.debug(f"    Merged and deactivated: '{dup.name}' (id={dup.id})")
+
+        # Reassign reviews from all duplicates to primary in one UPDATE
+        moved = self.session.execute(
+            update(Review)
+            .where(Review.clinic_id.in_([dup.id for dup in duplicates]))
+            .values(clinic_id=primary.id)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+        # One line per group (per-duplicate details are DEBUG)
+        logger.info(
+            f"  Merged {len(duplicates)} duplicate(s) into '{primary.name}' "
+            f"(id={primary.id}), moved {moved} reviews"
+        )
 
         primary.last_updated = datetime.utcnow()
-        self.session.commit()
 
     def clean_and_standardize(self):
         """
@@ -215,36 +377,45 @@ class DataCleaner:
         logger.info("STEP 2: Cleaning and standardizing data")
         logger.info("=" * 60)
 
-        clinics = self.session.query(Clinic).filter(
-            Clinic.is_active == True
-        ).all()
-
-        for clinic in clinics:
-            changed = False
-
-            # Clean phone number
-            if clinic.phone:
-                clean_phone = self._format_phone(clinic.phone)
-                if clean_phone != clinic.phone:
-                    clinic.phone = clean_phone
-                    changed = True
+        # Only the columns being cleaned, as plain rows streamed in batches
+        rows = self.session.execute(
+            select(Clinic.id, Clinic.phone, Clinic.name, Clinic.zip_code)
+            .where(Clinic.is_active == True)
+            .execution_options(yield_per=1000)
+        )
+
+        changes = []
+        for clinic_id, phone, name, zip_code in rows:
+            change = {}
+
+            # Clean phone number (bulk UPDATE skips Clinic's validators, so
+            # the normalized match keys are set here)
+            if phone:
+                clean_phone = self._format_phone(phone)
+                if clean_phone != phone:
+                    change['phone'] = clean_phone
+                    change['phone_norm'] = ClinicMatcher.normalize_phone(clean_phone)
 
             # Clean name
-            if clinic.name:
-                clean_name = self._clean_name(clinic.name)
-                if clean_name != clinic.name:
-                    clinic.name = clean_name
-                    changed = True
+            if name:
+                clean_name = self._clean_name(name)
+                if clean_name != name:
+                    change['name'] = clean_name
+                    change['name_norm'] = ClinicMatcher.normalize_name(clean_name)
 
             # Clean ZIP code
-            if clinic.zip_code:
-                clean_zip = self._clean_zip(clinic.zip_code)
-                if clean_zip != clinic.zip_code:
-                    clinic.zip_code = clean_zip
-                    changed = True
+            if zip_code:
+                clean_zip = self._clean_zip(zip_code)
+                if clean_zip != zip_code:
+                    change['zip_code'] = clean_zip
 
-            if changed:
-                self.records_cleaned += 1
+            if change:
+                changes.append({'id': clinic_id, **change})
+
+        # One executemany UPDATE by primary key for the changed rows
+        if changes:
+            self.session.execute(update(Clinic), changes)
+        self.records_cleaned += len(changes)
 
         self.session.commit()
         logger.info(f"Records cleaned: {self.records_cleaned}")
@@ -261,7 +432,7 @@ class DataCleaner:
             return phone
 
         # Extract digits
-        digits = re.sub(r'\D', '', phone)
+        digits = NON_DIGIT_PATTERN.sub('', phone)
 
         # Remove country code
         if len(digits) == 11 and digits.startswith('1'):
@@ -305,7 +476,7 @@ class DataCleaner:
             return zip_code
 
         # Extract first 5 digits
-        digits = re.sub(r'\D', '', str(zip_code))
+        digits = NON_DIGIT_PATTERN.sub('', str(zip_code))
         if len(digits) >= 5:
             return digits[:5]
 
@@ -321,103 +492,70 @@ class DataCleaner:
         - total_review_count: Sum of reviews from both sources
         - data_sources: "Google+Yelp", "Google Only", "Yelp Only"
         - data_quality_score: 0-100 based on completeness
-        """
-        logger.info("=" * 60)
-        logger.info("STEP 3: Creating combined metrics")
-        logger.info("=" * 60)
-
-        clinics = self.session.query(Clinic).filter(
-            Clinic.is_active == True
-        ).all()
-
-        metrics = []
-        for clinic in clinics:
-            metric = self._calculate_combined_metrics(clinic)
-            metrics.append(metric)
-
-        logger.info(f"Calculated metrics for {len(metrics)} clinics")
-        return metrics
-
-    def _calculate_combined_metrics(self, clinic):
-        """
-        Calculate combined metrics for a single clinic.
-        """
-        # Determine data sources
-        has_google = clinic.google_place_id is not None
-        has_yelp = clinic.yelp_business_id is not None
-
-        if has_google and has_yelp:
-            data_sources = "Google+Yelp"
-        elif has_google:
-            data_sources = "Google Only"
-        elif has_yelp:
-            data_sources = "Yelp Only"
-        else:
-            data_sources = "Unknown"
-
-        # Calculate combined rating
-        ratings = []
-        if clinic.google_rating:
-            ratings.append(clinic.google_rating)
-        if clinic.yelp_rating:
-            ratings.append(clinic.yelp_rating)
-
-        combined_rating = sum(ratings) / len(ratings) if ratings else None
-
-        # Calculate total reviews
-        total_reviews = (clinic.google_review_count or 0) + (clinic.yelp_review_count or 0)
-
-        # Calculate data quality score (0-100)
-        quality_score = 0
-        if clinic.name:
-            quality_score += 10
-        if clinic.address:
-            quality_score += 10
-        if clinic.phone:
-            quality_score += 10
-        if clinic.latitude and clinic.longitude:
-            quality_score += 10
-        if clinic.google_place_id:
-            quality_score += 15
-        if clinic.yelp_business_id:
-            quality_score += 15
-        if clinic.google_rating:
-            quality_score += 10
-        if clinic.yelp_rating:
-            quality_score += 10
-        if clinic.website:
-            quality_score += 5
-        if clinic.clinic_type:
-            quality_score += 5
 
-        return {
-            'clinic_id': clinic.id,
-            'name': clinic.name,
-            'address': clinic.address,
-            'city': clinic.city,
-            'state': clinic.state,
-            'zip_code': clinic.zip_code,
-            'phone': clinic.phone,
-            'website': clinic.website,
-            'latitude': clinic.latitude,
-            'longitude': clinic.longitude,
-            'clinic_type': clinic.clinic_type,
+        Yields one dict per active clinic, streamed from
+        combined_metrics_query in batches of 1000 rather than built as one
+        list.
+        """
+        result = self.session.execute(
+            self.combined_metrics_query().execution_options(yield_per=1000)
+        )
+        for row in result:
+            yield row._asdict()
+
+    @staticmethod
+    def combined_metrics_query():
+        """
+        One SELECT returning the export row of every active clinic, with the
+        combined metrics computed by the database.
+
+        Uses the same SQL expressions as the enrichment step
+        (DataEnrichment.derived_values); only the data_sources labels differ.
+        Enriched columns aren't read back because merging duplicates may
+        have changed ratings since enrichment ran.
+
+        EXAMPLE ROW:
+            clinic_id=5, name='Rush Medical', ..., combined_rating=4.25,
+            total_review_count=150, data_sources='Google+Yelp',
+            data_quality_score=95, is_complete=True, has_both_apis=True
+        """
+        derived = DataEnrichment.derived_values()
+        has_google = Clinic.google_place_id.isnot(None)
+        has_yelp = Clinic.yelp_business_id.isnot(None)
+
+        return select(
+            Clinic.id.label('clinic_id'),
+            Clinic.name,
+            Clinic.address,
+            Clinic.city,
+            Clinic.state,
+            Clinic.zip_code,
+            Clinic.phone,
+            Clinic.website,
+            Clinic.latitude,
+            Clinic.longitude,
+            Clinic.clinic_type,
             # Google metrics
-            'google_place_id': clinic.google_place_id,
-            'google_rating': clinic.google_rating,
-            'google_review_count': clinic.google_review_count,
+            Clinic.google_place_id,
+            Clinic.google_rating,
+            Clinic.google_review_count,
             # Yelp metrics
-            'yelp_business_id': clinic.yelp_business_id,
-            'yelp_rating': clinic.yelp_rating,
-            'yelp_review_count': clinic.yelp_review_count,
+            Clinic.yelp_business_id,
+            Clinic.yelp_rating,
+            Clinic.yelp_review_count,
             # COMBINED METRICS (new for Power BI)
-            'combined_rating': round(combined_rating, 2) if combined_rating else None,
-            'total_review_count': total_reviews,
-            'data_sources': data_sources,
-            'data_quality_score': quality_score,
-            'is_complete': quality_score >= 70,
-            'has_both_apis': has_google and has_yelp,
-        }
+            cast(derived['combined_rating'], Float).label('combined_rating'),
+            derived['combined_review_count'].label('total_review_count'),
+            case(
+                (and_(has_google, has_yelp), 'Google+Yelp'),
+                (has_google, 'Google Only'),
+                (has_yelp, 'Yelp Only'),
+                else_='Unknown'
+            ).label('data_sources'),
+            derived['data_quality_score'].label('data_quality_score'),
+            (derived['data_quality_score'] >= 70).label('is_complete'),
+            and_(has_google, has_yelp).label('has_both_apis'),
+        ).where(Clinic.is_active == True).order_by(Clinic.id)
 
     def export_for_powerbi(self, output_dir=None):
         """
@@ -439,22 +577,20 @@ class DataCleaner:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Get combined metrics
-        metrics = self.create_combined_metrics()
-
-        # 1. Export clean clinics
+        # 1. Export clean clinics (combined metrics query written straight
+        # to CSV: COPY on PostgreSQL, streamed cursor rows elsewhere)
         clinics_file = output_dir / "clinics_clean.csv"
-        self._export_csv(metrics, clinics_file)
-        logger.info(f"Exported: {clinics_file} ({len(metrics)} records)")
+        total_records = export_query_to_csv(self.session, self.combined_metrics_query(), clinics_file)
+        logger.info(f"Exported: {clinics_file} ({total_records} records)")
 
         # 2. Export summary by ZIP
-        summary = self._create_zip_summary(metrics)
+        summary = self._create_zip_summary()
         summary_file = output_dir / "clinics_by_zip_summary.csv"
         self._export_csv(summary, summary_file)
         logger.info(f"Exported: {summary_file} ({len(summary)} ZIP codes)")
 
         # 3. Export data quality report
-        quality_report = self._create_quality_report(metrics)
+        quality_report = self._create_quality_report(self.create_combined_metrics())
         quality_file = output_dir / "data_quality_report.csv"
         self._export_csv(quality_report, quality_file)
         logger.info(f"Exported: {quality_file}")
@@ -463,89 +599,137 @@ class DataCleaner:
             'clinics_file': str(clinics_file),
             'summary_file': str(summary_file),
             'quality_file': str(quality_file),
-            'total_records': len(metrics)
+            'total_records': total_records
         }
 
+    def export_tables(self, output_dir=None):
+        """
+        Export every database table as-is to <table>.csv (Power BI backup).
+
+        Each table is one COPY ... TO STDOUT on PostgreSQL (streamed batches
+        elsewhere) instead of building rows through the ORM.
+
+        OUTPUT FILES:
+        -------------
+        clinics.csv, reviews.csv, search_trends.csv, visibility_scores.csv,
+        demand_metrics.csv, competitor_analysis.csv, data_collection_logs.csv
+        """
+        if output_dir is None:
+            output_dir = Path(__file__).resolve().parent.parent.parent / "data" / "exports"
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        row_counts = {}
+        for table in Base.metadata.sorted_tables:
+            filepath = output_dir / f"{table.name}.csv"
+            row_counts[table.name] = export_query_to_csv(
+                self.session, select(table).order_by(*table.primary_key.columns), filepath
+            )
+            logger.info(f"Exported: {filepath} ({row_counts[table.name]} records)")
+
+        return row_counts
+
     def _export_csv(self, data, filepath):
-        """Export list of dicts to CSV."""
-        if not data:
-            return
+        """
+        Export dicts (a list or any iterable, e.g. a generator) to CSV.
+
+        Rows are written as they are read; the header comes from the first
+        row. Nothing is written for no rows.
+
+        Returns: number of rows written
+        """
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None:
+            return 0
 
         with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=data[0].keys())
+            writer = csv.DictWriter(f, fieldnames=first.keys())
             writer.writeheader()
-            writer.writerows(data)
+            writer.writerow(first)
+            row_count = 1
+            for row in rows:
+                writer.writerow(row)
+                row_count += 1
+
+        return row_count
 
-    def _create_zip_summary(self, metrics):
+    def _create_zip_summary(self):
         """
         Create summary statistics by ZIP code.
 
+        One GROUP BY over the export rows (combined_metrics_query) computes
+        the per-ZIP counts and sums in the database; only the final
+        averages/percentages are rounded here. ZIPs come out by clinic
+        count, ties in order of first appearance.
+
         EXAMPLE OUTPUT:
         ---------------
         zip_code | clinic_count | avg_rating | total_reviews | pct_complete
         60601    | 15           | 4.2        | 1250          | 80%
         60602    | 8            | 3.9        | 560           | 62%
         """
-        zip_stats = {}
-
-        for m in metrics:
-            zip_code = m['zip_code'] or 'Unknown'
-
-            if zip_code not in zip_stats:
-                zip_stats[zip_code] = {
-                    'zip_code': zip_code,
-                    'clinic_count': 0,
-                    'ratings': [],
-                    'total_reviews': 0,
-                    'complete_count': 0,
-                    'both_apis_count': 0,
-                }
-
-            stats = zip_stats[zip_code]
-            stats['clinic_count'] += 1
-            stats['total_reviews'] += m['total_review_count']
-
-            if m['combined_rating']:
-                stats['ratings'].append(m['combined_rating'])
-            if m['is_complete']:
-                stats['complete_count'] += 1
-            if m['has_both_apis']:
-                stats['both_apis_count'] += 1
+        metrics = self.combined_metrics_query().order_by(None).subquery()
+        zip_code = case(
+            (func.coalesce(metrics.c.zip_code, '') == '', 'Unknown'),
+            else_=metrics.c.zip_code
+        )
+        clinic_count = func.count()
+
+        rows = self.session.execute(
+            select(
+                zip_code.label('zip_code'),
+                clinic_count.label('clinic_count'),
+                func.sum(metrics.c.combined_rating).label('rating_sum'),
+                func.count(metrics.c.combined_rating).label('rating_count'),
+                func.sum(metrics.c.total_review_count).label('total_reviews'),
+                func.sum(case((metrics.c.is_complete, 1), else_=0)).label('complete_count'),
+                func.sum(case((metrics.c.has_both_apis, 1), else_=0)).label('both_apis_count'),
+            )
+            .group_by(zip_code)
+            .order_by(clinic_count.desc(), func.min(metrics.c.clinic_id))
+        ).all()
 
         # Calculate averages
-        summary = []
-        for zip_code, stats in zip_stats.items():
-            avg_rating = (
-                round(sum(stats['ratings']) / len(stats['ratings']), 2)
-                if stats['ratings'] else None
-            )
-            pct_complete = round(stats['complete_count'] / stats['clinic_count'] * 100, 1)
-            pct_both_apis = round(stats['both_apis_count'] / stats['clinic_count'] * 100, 1)
-
-            summary.append({
-                'zip_code': zip_code,
-                'clinic_count': stats['clinic_count'],
-                'avg_rating': avg_rating,
-                'total_reviews': stats['total_reviews'],
-                'pct_complete_data': pct_complete,
-                'pct_both_apis': pct_both_apis,
-            })
-
-        # Sort by clinic count
-        summary.sort(key=lambda x: x['clinic_count'], reverse=True)
-        return summary
+        return [
+            {
+                'zip_code': row.zip_code,
+                'clinic_count': row.clinic_count,
+                'avg_rating': (
+                    round(row.rating_sum / row.rating_count, 2)
+                    if row.rating_count else None
+                ),
+                'total_reviews': row.total_reviews,
+                'pct_complete_data': round(row.complete_count / row.clinic_count * 100, 1),
+                'pct_both_apis': round(row.both_apis_count / row.clinic_count * 100, 1),
+            }
+            for row in rows
+        ]
 
     def _create_quality_report(self, metrics):
         """
         Create data quality report for Power BI.
+
+        All counts are taken in ONE pass, so `metrics` may be a generator
+        (e.g. create_combined_metrics()) and is never held in memory.
         """
-        total = len(metrics)
-        google_only = sum(1 for m in metrics if m['data_sources'] == 'Google Only')
-        yelp_only = sum(1 for m in metrics if m['data_sources'] == 'Yelp Only')
-        both = sum(1 for m in metrics if m['data_sources'] == 'Google+Yelp')
-        complete = sum(1 for m in metrics if m['is_complete'])
-        missing_phone = sum(1 for m in metrics if not m['phone'])
-        missing_coords = sum(1 for m in metrics if not m['latitude'])
+        total = google_only = yelp_only = both = complete = missing_phone = missing_coords = 0
+        for m in metrics:
+            total += 1
+            data_sources = m['data_sources']
+            if data_sources == 'Google Only':
+                google_only += 1
+            elif data_sources == 'Yelp Only':
+                yelp_only += 1
+            elif data_sources == 'Google+Yelp':
+                both += 1
+            if m['is_complete']:
+                complete += 1
+            if not m['phone']:
+                missing_phone += 1
+            if not m['latitude']:
+                missing_coords += 1
 
         return [
             {'metric': 'Total Clinics', 'value': total, 'percentage': '100%'},
@@ -11,10 +11,19 @@ MATCHING STRATEGY:
 4. Phone Matching - Same phone number = same clinic
 """
 
-import re
+import sys
 import math
-from difflib import SequenceMatcher
+from pathlib import Path
 from loguru import logger
+from rapidfuzz import fuzz, process
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from src.database import normalize_match_keys
+
+
+# NumPy is imported inside the batch methods that use it: callers that
+# only need the normalizers shouldn't pay numpy's import time.
 
 
 class ClinicMatcher:
@@ -44,31 +53,10 @@ class ClinicMatcher:
     COORDINATE_DISTANCE_METERS = 50   # Within 50 meters = same location
     ADDRESS_SIMILARITY_THRESHOLD = 0.80  # 80% address similarity
 
-    # Common words to remove for better name matching
-    NOISE_WORDS = [
-        'clinic', 'medical', 'center', 'healthcare', 'health', 'care',
-        'hospital', 'group', 'practice', 'associates', 'physicians',
-        'llc', 'inc', 'pc', 'md', 'dds', 'the', 'of', 'at', 'and'
-    ]
-
-    # Address abbreviation mappings
-    ADDRESS_ABBREVIATIONS = {
-        'street': 'st', 'st.': 'st', 'str': 'st',
-        'avenue': 'ave', 'ave.': 'ave', 'av': 'ave',
-        'boulevard': 'blvd', 'blvd.': 'blvd',
-        'drive': 'dr', 'dr.': 'dr',
-        'road': 'rd', 'rd.': 'rd',
-        'lane': 'ln', 'ln.': 'ln',
-        'court': 'ct', 'ct.': 'ct',
-        'place': 'pl', 'pl.': 'pl',
-        'north': 'n', 'n.': 'n',
-        'south': 's', 's.': 's',
-        'east': 'e', 'e.': 'e',
-        'west': 'w', 'w.': 'w',
-        'suite': 'ste', 'ste.': 'ste', 'unit': 'ste',
-        'floor': 'fl', 'fl.': 'fl',
-        'apartment': 'apt', 'apt.': 'apt',
-    }
+    # Normalization tables (defined with the normalizers in
+    # src.database.normalize_match_keys)
+    NOISE_WORDS = normalize_match_keys.NOISE_WORDS
+    ADDRESS_ABBREVIATIONS = normalize_match_keys.ADDRESS_ABBREVIATIONS
 
     @classmethod
     def normalize_name(cls, name):
@@ -78,27 +66,8 @@ class ClinicMatcher:
         EXAMPLE:
             Input:  "Northwestern Memorial Hospital & Medical Center"
             Output: "northwestern memorial"
-
-            Input:  "Dr. Smith's Family Practice, LLC"
-            Output: "dr smiths family"
         """
-        if not name:
-            return ""
-
-        # Lowercase
-        normalized = name.lower()
-
-        # Remove punctuation except spaces
-        normalized = re.sub(r"[^\w\s]", " ", normalized)
-
-        # Remove noise words
-        words = normalized.split()
-        words = [w for w in words if w not in cls.NOISE_WORDS]
-
-        # Remove extra spaces
-        normalized = " ".join(words).strip()
-
-        return normalized
+        return normalize_match_keys.normalize_name(name)
 
     @classmethod
     def normalize_address(cls, address):
@@ -106,33 +75,10 @@ class ClinicMatcher:
         Normalize address for comparison.
 
         EXAMPLE:
-            Input:  "251 E. Huron Street, Suite 100, Chicago, IL 60611"
-            Output: "251 e huron st ste 100 chicago il 60611"
-
-            Input:  "251 East Huron St"
-            Output: "251 e huron st"
+            Input:  "251 E. Huron Street, Suite 100"
+            Output: "251 e huron st ste 100"
         """
-        if not address:
-            return ""
-
-        # Lowercase
-        normalized = address.lower()
-
-        # Remove punctuation
-        normalized = re.sub(r"[^\w\s]", " ", normalized)
-
-        # Split into words
-        words = normalized.split()
-
-        # Replace abbreviations
-        normalized_words = []
-        for word in words:
-            normalized_words.append(cls.ADDRESS_ABBREVIATIONS.get(word, word))
-
-        # Remove extra spaces
-        normalized = " ".join(normalized_words).strip()
-
-        return normalized
+        return normalize_match_keys.normalize_address(address)
 
     @classmethod
     def normalize_phone(cls, phone):
@@ -142,21 +88,8 @@ class ClinicMatcher:
         EXAMPLE:
             Input:  "+1 (312) 926-2000"
             Output: "3129262000"
-
-            Input:  "312.926.2000"
-            Output: "3129262000"
         """
-        if not phone:
-            return ""
-
-        # Extract digits only
-        digits = re.sub(r"\D", "", phone)
-
-        # Remove country code if present (assuming US)
-        if len(digits) == 11 and digits.startswith("1"):
-            digits = digits[1:]
-
-        return digits
+        return normalize_match_keys.normalize_phone(phone)
 
     @classmethod
     def calculate_name_similarity(cls, name1, name2):
@@ -183,21 +116,77 @@ class ClinicMatcher:
 
             Similarity: 0.67 (partial match)
         """
-        norm1 = cls.normalize_name(name1)
-        norm2 = cls.normalize_name(name2)
+        return cls.normalized_similarity(cls.normalize_name(name1), cls.normalize_name(name2))
+
+    @classmethod
+    def normalized_similarity(cls, norm1, norm2):
+        """
+        Similarity (0-1) of two already-normalized names or addresses.
 
+        Empty values never match.
+        """
         if not norm1 or not norm2:
             return 0.0
 
-        # Use SequenceMatcher for fuzzy comparison
-        similarity = SequenceMatcher(None, norm1, norm2).ratio()
+        # RapidFuzz ratio (C++ Indel similarity, 0-100) scaled to 0-1
+        return fuzz.ratio(norm1, norm2) / 100
+
+    @classmethod
+    def calculate_name_similarities(cls, name, candidate_names, candidate_norms=None):
+        """
+        Similarity of one name against many candidates in a single C call.
+
+        Same scores as calculate_name_similarity, but the comparison loop
+        runs inside RapidFuzz's cdist instead of Python. Pass candidate_norms
+        (already normalized names) to skip re-normalizing the candidates.
+
+        EXAMPLE:
+            name: "ABC Family Clinic"
+            candidate_names: ["ABC Family Medical Clinic", "XYZ Dental", None]
+
+            Normalized: "abc family" vs ["abc family", "xyz dental", ""]
+            Result: [1.0, 0.3, 0.0]
+        """
+        if candidate_norms is None:
+            candidate_norms = [cls.normalize_name(n) for n in candidate_names]
+
+        return cls.normalized_similarities(cls.normalize_name(name), candidate_norms)
+
+    @classmethod
+    def normalized_similarities(cls, norm, candidate_norms):
+        """
+        normalized_similarity of one normalized name or address against
+        many, as one RapidFuzz cdist call.
+
+        EXAMPLE:
+            norm: "251 e huron st"
+            candidate_norms: ["251 e huron st ste 100", "900 n michigan ave", ""]
+            Result: [0.78, 0.3, 0.0]
+        """
+        if not norm or not candidate_norms:
+            return [0.0] * len(candidate_norms)
+
+        import numpy as np
 
-        return similarity
+        # float64 scores equal fuzz.ratio's exactly (the float32 default
+        # doesn't, which could tip a score across a threshold)
+        scores = process.cdist([norm], candidate_norms, scorer=fuzz.ratio, dtype=np.float64)[0]
+
+        # Empty values never match (ratio("", "") would be 100)
+        return [
+            float(score) / 100 if candidate_norm else 0.0
+            for score, candidate_norm in zip(scores, candidate_norms)
+        ]
 
     @classmethod
     def calculate_distance_meters(cls, lat1, lng1, lat2, lng2):
         """
-        Calculate distance between two coordinates using Haversine formula.
+        Calculate distance between two coordinates.
+
+        Uses the equirectangular (small-angle) approximation of the
+        Haversine formula: one cos and one hypot instead of sin/cos/atan2.
+        At city scale it agrees with Haversine to well under a millimetre
+        for anything near the 50m threshold (~0.3mm at 7km).
 
         EXAMPLE:
             Point 1: Northwestern Hospital (41.8965, -87.6205)
@@ -217,20 +206,68 @@ class ClinicMatcher:
         # Earth radius in meters
         R = 6371000
 
-        # Convert to radians
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
+        # Longitude degrees shrink with cos(latitude) at the midpoint
         delta_lat = math.radians(lat2 - lat1)
-        delta_lng = math.radians(lng2 - lng1)
+        delta_lng = math.radians(lng2 - lng1) * math.cos(math.radians((lat1 + lat2) / 2))
 
-        # Haversine formula
-        a = (math.sin(delta_lat / 2) ** 2 +
-             math.cos(lat1_rad) * math.cos(lat2_rad) *
-             math.sin(delta_lng / 2) ** 2)
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+        return R * math.hypot(delta_lat, delta_lng)
 
-        distance = R * c
-        return distance
+    @classmethod
+    def calculate_distances_meters(cls, lat, lng, latitudes, longitudes):
+        """
+        Distance from one point to many, as one NumPy expression.
+
+        Same formula as calculate_distance_meters; candidates (or a query
+        point) without coordinates get inf.
+
+        EXAMPLE:
+            Point: (41.8965, -87.6205)
+            Candidates: [(41.8966, -87.6204), (41.9000, -87.6300), (None, None)]
+            Result: array([~14, ~870, inf])
+        """
+        import numpy as np
+
+        count = len(latitudes)
+        if lat is None or lng is None:
+            return np.full(count, np.inf)
+
+        lats = np.array([np.nan if v is None else v for v in latitudes], dtype=np.float64)
+        lngs = np.array([np.nan if v is None else v for v in longitudes], dtype=np.float64)
+
+        # Earth radius in meters
+        R = 6371000
+
+        # Equirectangular approximation (see calculate_distance_meters)
+        delta_lat = np.radians(lats - lat)
+        delta_lng = np.radians(lngs - lng) * np.cos(np.radians((lats + lat) / 2))
+
+        distances = R * np.hypot(delta_lat, delta_lng)
+        distances[np.isnan(distances)] = np.inf
+        return distances
+
+    @classmethod
+    def bounding_box(cls, lat, lng, meters=None):
+        """
+        Lat/lng box that contains every point within `meters` of (lat, lng).
+
+        Used as an index-friendly prefilter before the distance check
+        (calculate_distance_meters): anything outside the box is farther
+        than `meters` away. Defaults to
+        COORDINATE_DISTANCE_METERS, the location-match radius.
+
+        EXAMPLE:
+            Point: (41.8965, -87.6205), 50m
+            Result: (~41.89605, ~41.89695, ~-87.62110, ~-87.61990)
+        """
+        if meters is None:
+            meters = cls.COORDINATE_DISTANCE_METERS
+
+        # Degrees per meter on a sphere of Earth's mean radius; 1% slack
+        # keeps the box a superset despite rounding
+        lat_delta = math.degrees(meters / 6371000) * 1.01
+        lng_delta = lat_delta / max(math.cos(math.radians(lat)), 1e-6)
+
+        return lat - lat_delta, lat + lat_delta, lng - lng_delta, lng + lng_delta
 
     @classmethod
     def calculate_address_similarity(cls, addr1, addr2):
@@ -247,14 +284,7 @@ class ClinicMatcher:
 
             Similarity: 0.85 (high match)
         """
-        norm1 = cls.normalize_address(addr1)
-        norm2 = cls.normalize_address(addr2)
-
-        if not norm1 or not norm2:
-            return 0.0
-
-        similarity = SequenceMatcher(None, norm1, norm2).ratio()
-        return similarity
+        return cls.normalized_similarity(cls.normalize_address(addr1), cls.normalize_address(addr2))
 
     @classmethod
     def is_phone_match(cls, phone1, phone2):
@@ -280,7 +310,7 @@ class ClinicMatcher:
         return norm1 == norm2
 
     @classmethod
-    def calculate_match_score(cls, clinic1, clinic2):
+    def calculate_match_score(cls, clinic1, clinic2, name_similarity=None, distance=None):
         """
         Calculate overall match score between two clinics.
 
@@ -297,6 +327,11 @@ class ClinicMatcher:
 
         Total >= 50 points = MATCH
 
+        name_similarity and distance can be passed in when they were already
+        computed in bulk (see calculate_name_similarities and
+        calculate_distances_meters). Stored name_norm /
+        address_norm / phone_norm values are used instead of re-normalizing.
+
         EXAMPLE:
             Clinic 1 (Google):
                 name: "Northwestern Memorial Hospital"
@@ -330,14 +365,19 @@ class ClinicMatcher:
                 return obj.get(key, default)
             return default
 
-        name1 = get_value(clinic1, 'name', '')
-        name2 = get_value(clinic2, 'name', '')
-
-        addr1 = get_value(clinic1, 'address', '')
-        addr2 = get_value(clinic2, 'address', '')
+        # Normalized keys: stored ones (Clinic.name_norm etc.) when present,
+        # otherwise normalized here
+        def get_normalized(obj, key, normalize):
+            stored = get_value(obj, f'{key}_norm', None)
+            if stored is not None:
+                return stored
+            return normalize(get_value(obj, key, ''))
 
         phone1 = get_value(clinic1, 'phone', '')
-        phone2 = get_value(clinic2, 'phone', '')
+
+        phone_norm1 = get_normalized(clinic1, 'phone', cls.normalize_phone)
+        phone_norm2 = get_normalized(clinic2, 'phone', cls.normalize_phone)
+        phone_match = bool(phone_norm1) and phone_norm1 == phone_norm2
 
         lat1 = get_value(clinic1, 'latitude', None)
         lng1 = get_value(clinic1, 'longitude', None)
@@ -345,24 +385,34 @@ class ClinicMatcher:
         lng2 = get_value(clinic2, 'longitude', None)
 
         # 1. Phone matching (strongest signal)
-        if cls.is_phone_match(phone1, phone2):
+        if phone_match:
             score += 40
             reasons.append(f"Phone match: {phone1}")
 
         # 2. Coordinate matching
-        distance = cls.calculate_distance_meters(lat1, lng1, lat2, lng2)
+        if distance is None:
+            distance = cls.calculate_distance_meters(lat1, lng1, lat2, lng2)
         if distance <= cls.COORDINATE_DISTANCE_METERS:
             score += 35
             reasons.append(f"Location match: {distance:.0f}m apart")
 
         # 3. Name similarity
-        name_sim = cls.calculate_name_similarity(name1, name2)
+        if name_similarity is None:
+            name_sim = cls.normalized_similarity(
+                get_normalized(clinic1, 'name', cls.normalize_name),
+                get_normalized(clinic2, 'name', cls.normalize_name)
+            )
+        else:
+            name_sim = name_similarity
         if name_sim >= cls.NAME_SIMILARITY_THRESHOLD:
             score += 15
             reasons.append(f"Name match: {name_sim:.0%} similar")
 
         # 4. Address similarity
-        addr_sim = cls.calculate_address_similarity(addr1, addr2)
+        addr_sim = cls.normalized_similarity(
+            get_normalized(clinic1, 'address', cls.normalize_address),
+            get_normalized(clinic2, 'address', cls.normalize_address)
+        )
         if addr_sim >= cls.ADDRESS_SIMILARITY_THRESHOLD:
             score += 10
             reasons.append(f"Address match: {addr_sim:.0%} similar")
@@ -380,12 +430,95 @@ class ClinicMatcher:
                 'name_similarity': name_sim,
                 'address_similarity': addr_sim,
                 'distance_meters': distance,
-                'phone_match': cls.is_phone_match(phone1, phone2)
+                'phone_match': phone_match
             }
         }
 
     @classmethod
-    def find_matching_clinic(cls, new_clinic_data, existing_clinics, same_zip_only=True):
+    def find_exact_match(cls, new_clinic_data, candidates, normalized_names=None):
+        """
+        Resolve the easy case without fuzzy scoring: exactly one candidate
+        shares both the normalized phone and the normalized name.
+
+        Phones are compared through a {phone_norm: [clinics]} hash index
+        built once per call, so only the clinics sharing the phone are
+        compared by name. Returns the clinic, or None to fall through to
+        find_matching_clinic (no phone/name, no exact hit, or an ambiguous
+        one).
+
+        EXAMPLE:
+            New:  "ABC Family Clinic", "(312) 555-0101"
+            DB:   "ABC Family Medical Clinic", "312-555-0101"
+            Keys: ("3125550101", "abc family") on both → exact match
+        """
+        phone_norm = cls.normalize_phone(new_clinic_data.get('phone'))
+        name_norm = cls.normalize_name(new_clinic_data.get('name'))
+        if not phone_norm or not name_norm:
+            return None
+
+        by_phone = {}
+        for clinic in candidates:
+            candidate_phone = getattr(clinic, 'phone_norm', None)
+            if candidate_phone is None:
+                candidate_phone = cls.normalize_phone(clinic.phone)
+            by_phone.setdefault(candidate_phone, []).append(clinic)
+
+        normalized_names = normalized_names or {}
+        exact = [
+            clinic for clinic in by_phone.get(phone_norm, [])
+            if (normalized_names[clinic.id] if clinic.id in normalized_names
+                else clinic.name_norm if getattr(clinic, 'name_norm', None) is not None
+                else cls.normalize_name(clinic.name)) == name_norm
+        ]
+        return exact[0] if len(exact) == 1 else None
+
+    @classmethod
+    def score_candidates(cls, new_clinic_data, candidates, name_similarities, distances):
+        """
+        Match scores (calculate_match_score points) for many candidates at once.
+
+        Each signal becomes a boolean array and the points are summed with
+        NumPy, instead of building a full result dict per candidate.
+        name_similarities and distances come precomputed (one cdist call,
+        one vectorized distance); address similarities are one more cdist.
+
+        EXAMPLE:
+            Candidates: [same phone + 10m away, 30m away + 80% name, 2km away]
+            Points:     [40 + 35,               35 + 15,             0]
+            Result:     array([75, 50, 0])
+        """
+        import numpy as np
+
+        def stored_or_normalized(obj, key, normalize):
+            stored = getattr(obj, f'{key}_norm', None)
+            return stored if stored is not None else normalize(getattr(obj, key, ''))
+
+        new_phone = new_clinic_data.get('phone_norm')
+        if new_phone is None:
+            new_phone = cls.normalize_phone(new_clinic_data.get('phone', ''))
+        new_address = new_clinic_data.get('address_norm')
+        if new_address is None:
+            new_address = cls.normalize_address(new_clinic_data.get('address', ''))
+
+        phone_matches = np.array([
+            bool(new_phone) and stored_or_normalized(clinic, 'phone', cls.normalize_phone) == new_phone
+            for clinic in candidates
+        ], dtype=bool)
+        address_similarities = np.array(cls.normalized_similarities(
+            new_address,
+            [stored_or_normalized(clinic, 'address', cls.normalize_address) for clinic in candidates]
+        ), dtype=np.float64)
+
+        return (
+            40 * phone_matches
+            + 35 * (np.asarray(distances) <= cls.COORDINATE_DISTANCE_METERS)
+            + 15 * (np.asarray(name_similarities, dtype=np.float64) >= cls.NAME_SIMILARITY_THRESHOLD)
+            + 10 * (address_similarities >= cls.ADDRESS_SIMILARITY_THRESHOLD)
+        ).astype(int)
+
+    @classmethod
+    def find_matching_clinic(cls, new_clinic_data, existing_clinics, same_zip_only=True,
+                             normalized_names=None):
         """
         Find the best matching existing clinic for new data.
 
@@ -393,6 +526,9 @@ class ClinicMatcher:
             new_clinic_data: Dict with new clinic info from API
             existing_clinics: List of Clinic ORM objects
             same_zip_only: If True, only compare within same ZIP code (faster)
+            normalized_names: Optional {clinic.id: normalize_name(clinic.name)}
+                computed once by the caller, reused across many calls
+                (otherwise a stored clinic.name_norm is used when set)
 
         Returns:
             (matched_clinic, match_result) or (None, None) if no match
@@ -406,27 +542,49 @@ class ClinicMatcher:
 
             Process:
                 1. Filter to same ZIP code (60612)
-                2. Calculate match scores for each
-                3. Return best match if score >= 50
+                2. Score all names at once (RapidFuzz cdist) and compute all
+                   distances at once (NumPy)
+                3. Calculate match scores for all of them (score_candidates)
+                4. Return best match if score >= 50
         """
         new_zip = new_clinic_data.get('zip_code') or new_clinic_data.get('location', {}).get('zip_code')
 
+        candidates = [
+            clinic for clinic in existing_clinics
+            if not (same_zip_only and new_zip and clinic.zip_code != new_zip)
+        ]
+        normalized_names = normalized_names or {}
+        candidate_norms = [
+            normalized_names[clinic.id] if clinic.id in normalized_names
+            else clinic.name_norm if getattr(clinic, 'name_norm', None) is not None
+            else cls.normalize_name(clinic.name)
+            for clinic in candidates
+        ]
+        name_similarities = cls.calculate_name_similarities(
+            new_clinic_data.get('name'), [clinic.name for clinic in candidates], candidate_norms
+        )
+
+        distances = cls.calculate_distances_meters(
+            new_clinic_data.get('latitude'), new_clinic_data.get('longitude'),
+            [clinic.latitude for clinic in candidates], [clinic.longitude for clinic in candidates]
+        )
+
+        scores = cls.score_candidates(new_clinic_data, candidates, name_similarities, distances)
+
         best_match = None
         best_result = None
         best_score = 0
 
-        for clinic in existing_clinics:
-            # Filter by ZIP code if enabled
-            if same_zip_only and new_zip and clinic.zip_code != new_zip:
-                continue
-
-            # Calculate match score
-            result = cls.calculate_match_score(new_clinic_data, clinic)
-
-            if result['is_match'] and result['score'] > best_score:
-                best_match = clinic
-                best_result = result
-                best_score = result['score']
+        # Only the winner gets the full calculate_match_score result (reasons,
+        # details); argmax keeps the first of equal scores, as before
+        if len(scores) and scores.max() >= 50:
+            best = int(scores.argmax())
+            best_match = candidates[best]
+            best_result = cls.calculate_match_score(
+                new_clinic_data, best_match,
+                name_similarity=name_similarities[best], distance=float(distances[best])
+            )
+            best_score = best_result['score']
 
         if best_match:
             logger.info(
@@ -14,10 +14,12 @@ IMPORTANT: Does NOT modify data_quality_score column.
 import sys
 import re
 from pathlib import Path
-from math import radians, cos, sin, asin, sqrt
 from loguru import logger
-from sqlalchemy import or_, func
-from collections import Counter
+from sqlalchemy import or_, func, select, update
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+import numpy as np
+from scipy.spatial import cKDTree
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
@@ -26,80 +28,215 @@ from src.database.initialize_create_database_tables import get_session
 from src.database.sqlalchemy_database_models import Clinic
 
 
-def haversine_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points on Earth (in meters)."""
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * asin(sqrt(a))
-    return 6371000 * c  # Earth radius in meters
+EARTH_RADIUS_METERS = 6371000
 
 
-def find_nearest_zipcode(target_clinic, clinics_with_zip, k=3):
+def to_unit_xyz(latitudes, longitudes):
+    """
+    Project latitude/longitude (degrees) onto the unit sphere.
+
+    Straight-line (chord) distance between projected points grows
+    monotonically with the great-circle distance, so a KD-tree over these
+    points returns the same neighbor order as sorting by haversine distance,
+    and chord_to_meters turns its distances back into meters.
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lng = np.radians(np.asarray(longitudes, dtype=float))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)))
+
+
+def chord_to_meters(chord):
+    """
+    Great-circle distance (meters) for a chord length on the unit sphere.
+
+    Same value as the haversine formula (2 * asin of half the chord), from
+    the distances the KD-tree already returns.
+    """
+    return 2 * np.arcsin(np.minimum(np.asarray(chord) / 2, 1.0)) * EARTH_RADIUS_METERS
+
+
+class ClinicLocationIndex:
+    """
+    KD-tree over clinic coordinates, built once per imputation run.
+
+    Replaces the per-clinic scan over every other clinic with a tree query.
+    Candidate filters (e.g. "has a Google rating") are checked at query time,
+    so values imputed earlier in the same run are picked up exactly as before.
+
+    EXAMPLE:
+        index = ClinicLocationIndex(all_clinics)
+        nearest = index.nearest(clinic, 5, lambda c: c.google_rating is not None)
+        # [(Clinic, 120.4), (Clinic, 310.9), ...]  (meters, closest first)
+    """
+
+    def __init__(self, clinics):
+        self.clinics = [c for c in clinics if c.latitude and c.longitude]
+        # Row of each indexed clinic in tree.data, whose unit-sphere point
+        # (the trig of its lat/lng) is then reused when it is the target
+        self.positions = {c.id: i for i, c in enumerate(self.clinics)}
+        self.tree = None
+        if self.clinics:
+            self.tree = cKDTree(to_unit_xyz(
+                [c.latitude for c in self.clinics],
+                [c.longitude for c in self.clinics]
+            ))
+
+    def nearest(self, target_clinic, k, predicate=None):
+        """
+        Find the k nearest clinics that satisfy predicate.
+
+        Returns: List of (clinic, distance_in_meters), closest first
+        """
+        if self.tree is None or not target_clinic.latitude or not target_clinic.longitude:
+            return []
+
+        position = self.positions.get(target_clinic.id)
+        if position is not None:
+            point = self.tree.data[position]
+        else:
+            point = to_unit_xyz([target_clinic.latitude], [target_clinic.longitude])[0]
+        total = len(self.clinics)
+        query_k = min(total, max(k * 4, 8))
+
+        while True:
+            chords, indices = self.tree.query(point, k=query_k)
+            matches = []
+            for chord, i in zip(np.atleast_1d(chords), np.atleast_1d(indices)):
+                clinic = self.clinics[i]
+                if predicate is None or predicate(clinic):
+                    matches.append((clinic, chord))
+                    if len(matches) == k:
+                        break
+
+            # Widen the search until enough candidates pass the filter
+            if len(matches) == k or query_k == total:
+                break
+            query_k = min(total, query_k * 4)
+
+        # Already closest first (tree order)
+        meters = chord_to_meters([chord for _, chord in matches])
+        return [(clinic, float(m)) for (clinic, _), m in zip(matches, meters)]
+
+    def nearest_many(self, target_clinics, k):
+        """
+        Find the k nearest clinics for many targets in ONE batched tree query.
+
+        Only for unfiltered lookups (no predicate), e.g. STEP 1 where every
+        indexed clinic already has a ZIP code.
+
+        Returns: One list of (clinic, distance_in_meters) per target, closest
+        first ([] for targets without coordinates)
+        """
+        results = [[] for _ in target_clinics]
+        located = [
+            i for i, c in enumerate(target_clinics) if c.latitude and c.longitude
+        ]
+        if self.tree is None or not located:
+            return results
+
+        k = min(k, len(self.clinics))
+        points = to_unit_xyz(
+            [target_clinics[i].latitude for i in located],
+            [target_clinics[i].longitude for i in located]
+        )
+        # workers=-1: scipy splits the batch across all cores (GIL released)
+        chords, indices = self.tree.query(points, k=k, workers=-1)
+        meters = np.reshape(chord_to_meters(chords), (len(located), k))
+
+        for i, row, row_meters in zip(located, np.reshape(indices, (len(located), k)), meters):
+            results[i] = [(self.clinics[j], float(m)) for j, m in zip(row, row_meters)]
+        return results
+
+
+def find_nearest_zipcode(target_clinic, clinics_with_zip, k=3, location_index=None):
     """Find ZIP code from k nearest clinics."""
     if not target_clinic.latitude or not target_clinic.longitude:
         return None, None, 0
 
-    distances = []
-    for clinic in clinics_with_zip:
-        if clinic.latitude and clinic.longitude and clinic.zip_code:
-            dist = haversine_distance(
-                target_clinic.latitude, target_clinic.longitude,
-                clinic.latitude, clinic.longitude
-            )
-            distances.append((clinic, dist))
+    if location_index is None:
+        location_index = ClinicLocationIndex(clinics_with_zip)
 
-    if not distances:
-        return None, None, 0
+    return most_common_zipcode(location_index.nearest(target_clinic, k, lambda c: c.zip_code))
 
-    distances.sort(key=lambda x: x[1])
-    nearest = distances[:k]
 
-    # Most common ZIP among k nearest neighbors
-    zip_counts = {}
-    for clinic, dist in nearest:
-        zip_code = clinic.zip_code
-        if zip_code not in zip_counts:
-            zip_counts[zip_code] = {'count': 0, 'min_distance': dist}
-        zip_counts[zip_code]['count'] += 1
-        zip_counts[zip_code]['min_distance'] = min(zip_counts[zip_code]['min_distance'], dist)
+def most_common_zipcode(nearest):
+    """
+    Vote a ZIP code from nearest neighbors.
 
-    best_zip = max(zip_counts.items(), key=lambda x: (x[1]['count'], -x[1]['min_distance']))
-    return best_zip[0], best_zip[1]['min_distance'], best_zip[1]['count']
+    Args:
+        nearest: List of (clinic, distance_in_meters), closest first
 
+    Returns: (zip_code, min_distance, neighbor_count) of the most common ZIP
+    (ties go to the closer one), or (None, None, 0)
+    """
+    if not nearest:
+        return None, None, 0
 
-def infer_clinic_type_from_name(name):
+    # Most common ZIP among k nearest neighbors. Neighbors come closest
+    # first, so a ZIP's first occurrence is its min distance, and
+    # most_common keeps first-seen order on ties (the closer ZIP wins)
+    zip_counts = Counter(clinic.zip_code for clinic, _ in nearest)
+    best_zip, count = zip_counts.most_common(1)[0]
+    min_distance = next(dist for clinic, dist in nearest if clinic.zip_code == best_zip)
+    return best_zip, min_distance, count
+
+
+# Keyword → clinic type tables, in priority order (most specific first):
+# the first type with any keyword contained in the text wins. Built once at
+# import instead of on every call.
+NAME_TYPE_KEYWORDS = (
+    ('urgent_care', ('urgent', 'immediate care', 'walk-in', 'express clinic', 'quick care')),
+    ('dental', ('dental', 'dentist', 'orthodont', 'teeth')),
+    ('pediatric', ('pediatric', 'children', 'kids', 'child health')),
+    ('specialty', ('surgery', 'plastic', 'cosmetic', 'dermatology', 'cardiology',
+                   'oncology', 'neurology', 'orthopedic', 'urology', 'radiology',
+                   'ophthalmology', 'ent', 'ear nose throat', 'allergy')),
+    ('mental_health', ('mental health', 'counseling', 'psychiatr', 'therapy', 'behavioral')),
+    ('womens_health', ('women', 'obstetric', 'gynecolog', 'obgyn', 'pregnancy', 'maternal')),
+    ('physical_therapy', ('physical therapy', 'rehab', 'physiotherapy', 'chiropract', 'massage')),
+    ('primary_care', ('family', 'primary care', 'general practice', 'internal medicine',
+                      'medical center', 'health center', 'clinic', 'physician')),
+)
+
+CATEGORY_TYPE_KEYWORDS = (
+    ('urgent_care', ('urgent care', 'walk-in clinic', 'emergency')),
+    ('dental', ('dentist', 'dental', 'orthodontist')),
+    ('pediatric', ('pediatrician', 'child health', 'kids')),
+    ('specialty', ('surgeon', 'plastic surgery', 'dermatologist', 'cardiologist',
+                   'oncologist', 'neurologist', 'orthopedist', 'urologist',
+                   'ophthalmologist', 'ear nose & throat', 'allergist')),
+    ('mental_health', ('counseling', 'mental health', 'psychiatrist', 'psychologist', 'therapy')),
+    ('womens_health', ('obstetrician', 'gynecologist', 'obgyn', 'women\'s health')),
+    ('physical_therapy', ('physical therapy', 'chiropractor', 'massage', 'acupuncture')),
+    ('primary_care', ('family practice', 'internal medicine', 'medical center',
+                      'general practitioner', 'primary care', 'concierge medicine')),
+)
+
+
+def match_type_keywords(text, type_keywords):
     """
-    Infer clinic type from name using keyword matching.
+    First clinic type (in priority order) with a keyword contained in text.
 
     Returns: clinic_type or None
     """
-    name_lower = name.lower()
-
-    # Priority order matching (most specific first)
-    type_keywords = {
-        'urgent_care': ['urgent', 'immediate care', 'walk-in', 'express clinic', 'quick care'],
-        'dental': ['dental', 'dentist', 'orthodont', 'teeth'],
-        'pediatric': ['pediatric', 'children', 'kids', 'child health'],
-        'specialty': ['surgery', 'plastic', 'cosmetic', 'dermatology', 'cardiology',
-                      'oncology', 'neurology', 'orthopedic', 'urology', 'radiology',
-                      'ophthalmology', 'ent', 'ear nose throat', 'allergy'],
-        'mental_health': ['mental health', 'counseling', 'psychiatr', 'therapy', 'behavioral'],
-        'womens_health': ['women', 'obstetric', 'gynecolog', 'obgyn', 'pregnancy', 'maternal'],
-        'physical_therapy': ['physical therapy', 'rehab', 'physiotherapy', 'chiropract', 'massage'],
-        'primary_care': ['family', 'primary care', 'general practice', 'internal medicine',
-                         'medical center', 'health center', 'clinic', 'physician']
-    }
-
-    for clinic_type, keywords in type_keywords.items():
+    for clinic_type, keywords in type_keywords:
         for keyword in keywords:
-            if keyword in name_lower:
+            if keyword in text:
                 return clinic_type
 
     return None
 
 
+def infer_clinic_type_from_name(name):
+    """
+    Infer clinic type from name using keyword matching.
+
+    Returns: clinic_type or None
+    """
+    return match_type_keywords(name.lower(), NAME_TYPE_KEYWORDS)
+
+
 def infer_clinic_type_from_categories(categories):
     """
     Infer clinic type from Yelp/Google categories.
@@ -112,32 +249,29 @@ def infer_clinic_type_from_categories(categories):
     if not categories:
         return None
 
-    categories_str = ' '.join(categories).lower()
-
-    # Category-to-type mapping
-    category_mapping = {
-        'urgent_care': ['urgent care', 'walk-in clinic', 'emergency'],
-        'dental': ['dentist', 'dental', 'orthodontist'],
-        'pediatric': ['pediatrician', 'child health', 'kids'],
-        'specialty': ['surgeon', 'plastic surgery', 'dermatologist', 'cardiologist',
-                      'oncologist', 'neurologist', 'orthopedist', 'urologist',
-                      'ophthalmologist', 'ear nose & throat', 'allergist'],
-        'mental_health': ['counseling', 'mental health', 'psychiatrist', 'psychologist', 'therapy'],
-        'womens_health': ['obstetrician', 'gynecologist', 'obgyn', 'women\'s health'],
-        'physical_therapy': ['physical therapy', 'chiropractor', 'massage', 'acupuncture'],
-        'primary_care': ['family practice', 'internal medicine', 'medical center',
-                         'general practitioner', 'primary care', 'concierge medicine']
-    }
-
-    for clinic_type, keywords in category_mapping.items():
-        for keyword in keywords:
-            if keyword in categories_str:
-                return clinic_type
+    return match_type_keywords(' '.join(categories).lower(), CATEGORY_TYPE_KEYWORDS)
 
-    return None
 
+def index_clinics_by_zip(all_clinics):
+    """
+    One ClinicLocationIndex per ZIP code, built once.
+
+    STEP 2's "3 nearest in the same ZIP" lookup then searches only that
+    ZIP's clinics instead of widening a citywide search until enough
+    same-ZIP neighbors turn up. ZIP codes are final after STEP 1.
 
-def impute_clinic_type(clinic, all_clinics):
+    EXAMPLE:
+        zip_indexes = index_clinics_by_zip(all_clinics)
+        zip_indexes['60614'].nearest(clinic, 3)
+    """
+    by_zip = defaultdict(list)
+    for c in all_clinics:
+        if c.zip_code and c.latitude and c.longitude:
+            by_zip[c.zip_code].append(c)
+    return {zip_code: ClinicLocationIndex(clinics) for zip_code, clinics in by_zip.items()}
+
+
+def impute_clinic_type(clinic, all_clinics, location_index=None, zip_indexes=None):
     """
     Impute clinic type using multiple strategies.
 
@@ -146,6 +280,9 @@ def impute_clinic_type(clinic, all_clinics):
     2. Extract from categories (Yelp/Google categories)
     3. Use most common type among 3 nearest clinics with same ZIP
     4. Fallback: "primary_care"
+
+    zip_indexes (from index_clinics_by_zip) narrows strategy 3 to the
+    clinic's own ZIP.
     """
     # Strategy 1: Infer from name
     type_from_name = infer_clinic_type_from_name(clinic.name)
@@ -160,43 +297,57 @@ def impute_clinic_type(clinic, all_clinics):
 
     # Strategy 3: Use K-Nearest Neighbors in same ZIP code
     if clinic.zip_code and clinic.latitude and clinic.longitude:
-        # Find clinics in same ZIP with valid types
-        same_zip_clinics = [
-            c for c in all_clinics
-            if c.zip_code == clinic.zip_code
+        if zip_indexes is not None:
+            location_index = zip_indexes.get(clinic.zip_code)
+        elif location_index is None:
+            location_index = ClinicLocationIndex(all_clinics)
+
+        # 3 nearest clinics in same ZIP with valid types (types imputed
+        # earlier in the step count, so they're checked at query time)
+        nearest_3 = [] if location_index is None else location_index.nearest(clinic, 3, lambda c: (
+            c.zip_code == clinic.zip_code
             and c.clinic_type
             and c.clinic_type.strip() != ''
             and c.clinic_type.strip().lower() not in ['unknown', 'none', 'null']
-            and c.latitude
-            and c.longitude
             and c.id != clinic.id
-        ]
+        ))
 
-        if same_zip_clinics:
-            # Calculate distances
-            distances = []
-            for c in same_zip_clinics:
-                dist = haversine_distance(
-                    clinic.latitude, clinic.longitude,
-                    c.latitude, c.longitude
-                )
-                distances.append((c, dist))
-
-            # Get 3 nearest
-            distances.sort(key=lambda x: x[1])
-            nearest_3 = distances[:3]
-
-            # Most common type among nearest 3
-            types = [c.clinic_type for c, _ in nearest_3]
-            if types:
-                most_common = Counter(types).most_common(1)[0][0]
-                return most_common, f'knn_same_zip'
+        # Most common type among nearest 3 (at most 3 items, so count in
+        # place; max keeps the first, i.e. closest, on ties)
+        types = [c.clinic_type for c, _ in nearest_3]
+        if types:
+            most_common = max(types, key=types.count)
+            return most_common, f'knn_same_zip'
 
     # Fallback: primary_care (most common clinic type)
     return 'primary_care', 'fallback_default'
 
 
-def impute_google_rating(clinic, all_clinics):
+def group_clinics_by_type(all_clinics):
+    """
+    Index clinics by (clinic_type, zip_code) and by clinic_type, once.
+
+    The rating strategies average over "same type in same ZIP" and "same
+    type citywide"; with these groups each average scans only its group
+    instead of every clinic. Groups hold the clinics themselves (in
+    all_clinics order), so ratings imputed earlier in a step are still
+    seen, exactly as with the full scan.
+
+    Returns: (by_type_zip, by_type) dicts of clinic lists
+
+    EXAMPLE:
+        by_type_zip[('dental', '60614')] → [Clinic(...), Clinic(...)]
+        by_type['dental'] → every dental clinic
+    """
+    by_type_zip = defaultdict(list)
+    by_type = defaultdict(list)
+    for c in all_clinics:
+        by_type_zip[(c.clinic_type, c.zip_code)].append(c)
+        by_type[c.clinic_type].append(c)
+    return by_type_zip, by_type
+
+
+def impute_google_rating(clinic, all_clinics, location_index=None, groups=None):
     """
     Impute Google rating using multiple strategies.
 
@@ -212,13 +363,15 @@ def impute_google_rating(clinic, all_clinics):
         imputed = min(5.0, clinic.yelp_rating + 0.1)
         return round(imputed, 1), 'yelp_proxy'
 
+    if groups is None:
+        groups = group_clinics_by_type(all_clinics)
+    by_type_zip, by_type = groups
+
     # Strategy 2: Average of same type in same ZIP
     if clinic.clinic_type and clinic.zip_code:
         same_type_zip = [
-            c.google_rating for c in all_clinics
-            if c.clinic_type == clinic.clinic_type
-            and c.zip_code == clinic.zip_code
-            and c.google_rating is not None
+            c.google_rating for c in by_type_zip.get((clinic.clinic_type, clinic.zip_code), [])
+            if c.google_rating is not None
             and c.id != clinic.id
         ]
         if same_type_zip:
@@ -227,36 +380,24 @@ def impute_google_rating(clinic, all_clinics):
 
     # Strategy 3: K-Nearest Neighbors (5 nearest with Google ratings)
     if clinic.latitude and clinic.longitude:
-        clinics_with_google = [
-            c for c in all_clinics
-            if c.google_rating is not None
-            and c.latitude and c.longitude
-            and c.id != clinic.id
-        ]
-
-        if clinics_with_google:
-            distances = []
-            for c in clinics_with_google:
-                dist = haversine_distance(
-                    clinic.latitude, clinic.longitude,
-                    c.latitude, c.longitude
-                )
-                distances.append((c, dist))
+        if location_index is None:
+            location_index = ClinicLocationIndex(all_clinics)
 
-            distances.sort(key=lambda x: x[1])
-            nearest_5 = distances[:5]
+        nearest_5 = location_index.nearest(clinic, 5, lambda c: (
+            c.google_rating is not None
+            and c.id != clinic.id
+        ))
 
-            ratings = [c.google_rating for c, _ in nearest_5]
-            if ratings:
-                avg = sum(ratings) / len(ratings)
-                return round(avg, 1), 'knn_5_nearest'
+        ratings = [c.google_rating for c, _ in nearest_5]
+        if ratings:
+            avg = sum(ratings) / len(ratings)
+            return round(avg, 1), 'knn_5_nearest'
 
     # Strategy 4: City-wide average for clinic type
     if clinic.clinic_type:
         same_type = [
-            c.google_rating for c in all_clinics
-            if c.clinic_type == clinic.clinic_type
-            and c.google_rating is not None
+            c.google_rating for c in by_type.get(clinic.clinic_type, [])
+            if c.google_rating is not None
         ]
         if same_type:
             avg = sum(same_type) / len(same_type)
@@ -272,7 +413,7 @@ def impute_google_rating(clinic, all_clinics):
     return 4.0, 'fallback_default'
 
 
-def impute_yelp_rating(clinic, all_clinics):
+def impute_yelp_rating(clinic, all_clinics, location_index=None, groups=None):
     """
     Impute Yelp rating using multiple strategies.
 
@@ -288,13 +429,15 @@ def impute_yelp_rating(clinic, all_clinics):
         imputed = max(1.0, clinic.google_rating - 0.1)
         return round(imputed, 1), 'google_proxy'
 
+    if groups is None:
+        groups = group_clinics_by_type(all_clinics)
+    by_type_zip, by_type = groups
+
     # Strategy 2: Average of same type in same ZIP
     if clinic.clinic_type and clinic.zip_code:
         same_type_zip = [
-            c.yelp_rating for c in all_clinics
-            if c.clinic_type == clinic.clinic_type
-            and c.zip_code == clinic.zip_code
-            and c.yelp_rating is not None
+            c.yelp_rating for c in by_type_zip.get((clinic.clinic_type, clinic.zip_code), [])
+            if c.yelp_rating is not None
             and c.id != clinic.id
         ]
         if same_type_zip:
@@ -303,36 +446,24 @@ def impute_yelp_rating(clinic, all_clinics):
 
     # Strategy 3: K-Nearest Neighbors (5 nearest with Yelp ratings)
     if clinic.latitude and clinic.longitude:
-        clinics_with_yelp = [
-            c for c in all_clinics
-            if c.yelp_rating is not None
-            and c.latitude and c.longitude
-            and c.id != clinic.id
-        ]
-
-        if clinics_with_yelp:
-            distances = []
-            for c in clinics_with_yelp:
-                dist = haversine_distance(
-                    clinic.latitude, clinic.longitude,
-                    c.latitude, c.longitude
-                )
-                distances.append((c, dist))
+        if location_index is None:
+            location_index = ClinicLocationIndex(all_clinics)
 
-            distances.sort(key=lambda x: x[1])
-            nearest_5 = distances[:5]
+        nearest_5 = location_index.nearest(clinic, 5, lambda c: (
+            c.yelp_rating is not None
+            and c.id != clinic.id
+        ))
 
-            ratings = [c.yelp_rating for c, _ in nearest_5]
-            if ratings:
-                avg = sum(ratings) / len(ratings)
-                return round(avg, 1), 'knn_5_nearest'
+        ratings = [c.yelp_rating for c, _ in nearest_5]
+        if ratings:
+            avg = sum(ratings) / len(ratings)
+            return round(avg, 1), 'knn_5_nearest'
 
     # Strategy 4: City-wide average for clinic type
     if clinic.clinic_type:
         same_type = [
-            c.yelp_rating for c in all_clinics
-            if c.clinic_type == clinic.clinic_type
-            and c.yelp_rating is not None
+            c.yelp_rating for c in by_type.get(clinic.clinic_type, [])
+            if c.yelp_rating is not None
         ]
         if same_type:
             avg = sum(same_type) / len(same_type)
@@ -348,36 +479,72 @@ def impute_yelp_rating(clinic, all_clinics):
     return 3.8, 'fallback_default'
 
 
-def calculate_rating_category(combined_rating):
+# Columns read (and imputed) by run_comprehensive_imputation
+IMPUTE_COLUMNS = (
+    Clinic.id, Clinic.name, Clinic.latitude, Clinic.longitude, Clinic.zip_code,
+    Clinic.clinic_type, Clinic.categories, Clinic.google_rating, Clinic.yelp_rating,
+    Clinic.combined_rating, Clinic.rating_category, Clinic.is_active
+)
+
+
+# Imputed rows written per bulk UPDATE
+UPDATE_BATCH_SIZE = 1000
+
+
+def flush_imputed(session, pending):
+    """
+    Write queued imputed values with one executemany UPDATE by primary key,
+    then clear the queue.
+
+    pending maps clinic id → {column: value}; rows may set different
+    columns. Nothing is committed here, so a failed run still rolls back.
+
+    EXAMPLE:
+        flush_imputed(session, {12: {'zip_code': '60614'}, 40: {'google_rating': 4.3}})
     """
-    Calculate rating category based on combined rating.
+    if pending:
+        session.execute(update(Clinic), [
+            {'id': clinic_id, **values} for clinic_id, values in pending.items()
+        ])
+        pending.clear()
+
+
+# Rating category bucket edges (lower bound inclusive) and their labels
+RATING_CATEGORY_BINS = (2.5, 3.5, 4.0)
+RATING_CATEGORY_LABELS = ('Low (0-2.5)', 'Medium (2.5-3.5)', 'Good (3.5-4.0)', 'Excellent (4.0+)')
+
+
+def calculate_rating_categories(combined_ratings):
+    """
+    Calculate rating categories for many combined ratings at once.
 
     Categories:
     - Excellent (4.0+)
     - Good (3.5-4.0)
     - Medium (2.5-3.5)
     - Low (0-2.5)
+
+    EXAMPLE:
+        calculate_rating_categories([4.2, 3.5, 2.4])
+        → ['Excellent (4.0+)', 'Good (3.5-4.0)', 'Low (0-2.5)']
     """
-    if combined_rating is None:
-        return None
+    buckets = np.digitize(np.asarray(combined_ratings, dtype=float), RATING_CATEGORY_BINS)
+    return [RATING_CATEGORY_LABELS[b] for b in buckets]
 
-    if combined_rating >= 4.0:
-        return 'Excellent (4.0+)'
-    elif combined_rating >= 3.5:
-        return 'Good (3.5-4.0)'
-    elif combined_rating >= 2.5:
-        return 'Medium (2.5-3.5)'
-    else:
-        return 'Low (0-2.5)'
+
+# Imputed rows logged per step unless verbose (the rest are summarized)
+LOGGED_ROWS_PER_STEP = 10
 
 
-def run_comprehensive_imputation(dry_run=False, include_inactive=True):
+def run_comprehensive_imputation(dry_run=False, include_inactive=True, verbose=False):
     """
     Run comprehensive imputation for all missing fields.
 
     Args:
         dry_run: If True, only show what would be changed without committing
         include_inactive: If True, also impute inactive clinics (for Power BI)
+        verbose: If True, log every imputed value (default: first
+            LOGGED_ROWS_PER_STEP per step)
 
     Returns:
         Dictionary with imputation statistics
@@ -389,18 +556,47 @@ def run_comprehensive_imputation(dry_run=False, include_inactive=True):
     session = get_session()
 
     try:
-        # Load ALL clinics (including inactive for Power BI completeness)
+        # Load ALL clinics (including inactive for Power BI completeness),
+        # only the IMPUTE_COLUMNS, as plain records instead of ORM objects
+        query = select(*IMPUTE_COLUMNS).order_by(Clinic.id)
+        if not include_inactive:
+            query = query.where(Clinic.is_active == True)
+        all_clinics = [SimpleNamespace(**row._mapping) for row in session.execute(query)]
+
         if include_inactive:
-            all_clinics = session.query(Clinic).all()
-            active_count = session.query(Clinic).filter(Clinic.is_active == True).count()
+            # Counted from the rows already loaded (no separate COUNT query)
+            active_count = sum(1 for c in all_clinics if c.is_active)
             logger.info(f"Total clinics: {len(all_clinics)} (Active: {active_count}, Inactive: {len(all_clinics) - active_count})")
         else:
-            all_clinics = session.query(Clinic).filter(Clinic.is_active == True).all()
             logger.info(f"Total active clinics: {len(all_clinics)}")
 
+        # Imputed values per clinic id, written back by primary key every
+        # UPDATE_BATCH_SIZE clinics (and once more before the commit)
+        pending = defaultdict(dict)
+
+        def set_imputed(clinic, **values):
+            """Apply imputed values to the record (later steps read them) and queue them."""
+            for field, value in values.items():
+                setattr(clinic, field, value)
+            pending[clinic.id].update(values)
+            if len(pending) >= UPDATE_BATCH_SIZE:
+                flush_imputed(session, pending)
+
+        def log_row(count):
+            """Whether the count-th imputed value of a step gets its own log line."""
+            return verbose or count <= LOGGED_ROWS_PER_STEP
+
+        def log_more(count, what):
+            """One summary line for a step's imputed values not logged individually."""
+            if not verbose and count > LOGGED_ROWS_PER_STEP:
+                logger.info(f"... and {count - LOGGED_ROWS_PER_STEP} more {what}")
+
         total = len(all_clinics)
         logger.info("")
 
+        # Coordinates don't change during imputation, so one tree serves every step
+        location_index = ClinicLocationIndex(all_clinics)
+
         stats = {
             'zip_codes_imputed': 0,
             'clinic_types_imputed': 0,
@@ -422,15 +618,22 @@ def run_comprehensive_imputation(dry_run=False, include_inactive=True):
         logger.info(f"Clinics with ZIP codes: {len(clinics_with_zip)}")
         logger.info(f"Clinics missing ZIP codes: {len(clinics_missing_zip)}")
 
-        for clinic in clinics_missing_zip:
-            imputed_zip, distance, neighbor_count = find_nearest_zipcode(clinic, clinics_with_zip, k=3)
+        # clinics_with_zip is fixed for this step (imputed ZIPs don't vote),
+        # so all neighbors come from one batched query
+        zip_index = ClinicLocationIndex(clinics_with_zip)
+        nearest_by_clinic = zip_index.nearest_many(clinics_missing_zip, k=3)
+
+        for clinic, nearest in zip(clinics_missing_zip, nearest_by_clinic):
+            imputed_zip, distance, neighbor_count = most_common_zipcode(nearest)
 
             if imputed_zip and distance <= 5000:  # Max 5km
                 if not dry_run:
-                    clinic.zip_code = imputed_zip
+                    set_imputed(clinic, zip_code=imputed_zip)
                 stats['zip_codes_imputed'] += 1
-                logger.info(f"{'[DRY RUN] ' if dry_run else ''}ZIP {imputed_zip} → {clinic.name[:50]} (distance: {distance:.0f}m)")
+                if log_row(stats['zip_codes_imputed']):
+                    logger.info(f"{'[DRY RUN] ' if dry_run else ''}ZIP {imputed_zip} → {clinic.name[:50]} (distance: {distance:.0f}m)")
 
+        log_more(stats['zip_codes_imputed'], 'ZIP codes')
         logger.info(f"✓ Imputed {stats['zip_codes_imputed']} ZIP codes")
         logger.info("")
 
@@ -447,66 +650,66 @@ def run_comprehensive_imputation(dry_run=False, include_inactive=True):
 
         logger.info(f"Clinics missing/unknown type: {len(clinics_missing_type)}")
 
+        zip_indexes = index_clinics_by_zip(all_clinics)
+
         for clinic in clinics_missing_type:
-            imputed_type, method = impute_clinic_type(clinic, all_clinics)
+            imputed_type, method = impute_clinic_type(clinic, all_clinics, location_index, zip_indexes)
 
             if not dry_run:
-                clinic.clinic_type = imputed_type
+                set_imputed(clinic, clinic_type=imputed_type)
             stats['clinic_types_imputed'] += 1
-            logger.info(f"{'[DRY RUN] ' if dry_run else ''}{imputed_type:20} → {clinic.name[:40]:40} (method: {method})")
+            if log_row(stats['clinic_types_imputed']):
+                logger.info(f"{'[DRY RUN] ' if dry_run else ''}{imputed_type:20} → {clinic.name[:40]:40} (method: {method})")
 
+        log_more(stats['clinic_types_imputed'], 'clinic types')
         logger.info(f"✓ Imputed {stats['clinic_types_imputed']} clinic types")
         logger.info("")
 
         # =================================================================
-        # STEP 3: GOOGLE RATING IMPUTATION
+        # STEPS 3-4: GOOGLE + YELP RATING IMPUTATION (one pass)
         # =================================================================
-        logger.info("STEP 3: Google Rating Imputation")
+        # A Google imputation never reads another clinic's Yelp rating (and
+        # vice versa), so imputing both for each clinic in turn gives the
+        # same values as a Google pass followed by a Yelp pass
+        logger.info("STEPS 3-4: Google & Yelp Rating Imputation")
         logger.info("-" * 80)
 
         clinics_missing_google = [c for c in all_clinics if c.google_rating is None]
+        clinics_missing_yelp = [c for c in all_clinics if c.yelp_rating is None]
 
         logger.info(f"Clinics missing Google rating: {len(clinics_missing_google)}")
+        logger.info(f"Clinics missing Yelp rating: {len(clinics_missing_yelp)}")
 
-        for clinic in clinics_missing_google:
-            imputed_rating, method = impute_google_rating(clinic, all_clinics)
-
-            if not dry_run:
-                clinic.google_rating = imputed_rating
-            stats['google_ratings_imputed'] += 1
-
-            if stats['google_ratings_imputed'] <= 10:  # Show first 10
-                logger.info(f"{'[DRY RUN] ' if dry_run else ''}{imputed_rating:.1f} → {clinic.name[:40]:40} (method: {method})")
-
-        if stats['google_ratings_imputed'] > 10:
-            logger.info(f"... and {stats['google_ratings_imputed'] - 10} more")
-
-        logger.info(f"✓ Imputed {stats['google_ratings_imputed']} Google ratings")
-        logger.info("")
+        # Types and ZIPs are final after STEPS 1-2, so one set of groups
+        # serves both ratings
+        rating_groups = group_clinics_by_type(all_clinics)
 
-        # =================================================================
-        # STEP 4: YELP RATING IMPUTATION
-        # =================================================================
-        logger.info("STEP 4: Yelp Rating Imputation")
-        logger.info("-" * 80)
+        for clinic in all_clinics:
+            if clinic.google_rating is None:
+                imputed_rating, method = impute_google_rating(clinic, all_clinics, location_index, rating_groups)
 
-        clinics_missing_yelp = [c for c in all_clinics if c.yelp_rating is None]
+                if not dry_run:
+                    set_imputed(clinic, google_rating=imputed_rating)
+                stats['google_ratings_imputed'] += 1
 
-        logger.info(f"Clinics missing Yelp rating: {len(clinics_missing_yelp)}")
+                if log_row(stats['google_ratings_imputed']):
+                    logger.info(f"{'[DRY RUN] ' if dry_run else ''}Google {imputed_rating:.1f} → {clinic.name[:40]:40} (method: {method})")
 
-        for clinic in clinics_missing_yelp:
-            imputed_rating, method = impute_yelp_rating(clinic, all_clinics)
+            # Sees this clinic's Google rating imputed just above
+            if clinic.yelp_rating is None:
+                imputed_rating, method = impute_yelp_rating(clinic, all_clinics, location_index, rating_groups)
 
-            if not dry_run:
-                clinic.yelp_rating = imputed_rating
-            stats['yelp_ratings_imputed'] += 1
+                if not dry_run:
+                    set_imputed(clinic, yelp_rating=imputed_rating)
+                stats['yelp_ratings_imputed'] += 1
 
-            if stats['yelp_ratings_imputed'] <= 10:  # Show first 10
-                logger.info(f"{'[DRY RUN] ' if dry_run else ''}{imputed_rating:.1f} → {clinic.name[:40]:40} (method: {method})")
+                if log_row(stats['yelp_ratings_imputed']):
+                    logger.info(f"{'[DRY RUN] ' if dry_run else ''}Yelp   {imputed_rating:.1f} → {clinic.name[:40]:40} (method: {method})")
 
-        if stats['yelp_ratings_imputed'] > 10:
-            logger.info(f"... and {stats['yelp_ratings_imputed'] - 10} more")
+        log_more(stats['google_ratings_imputed'], 'Google ratings')
+        log_more(stats['yelp_ratings_imputed'], 'Yelp ratings')
 
+        logger.info(f"✓ Imputed {stats['google_ratings_imputed']} Google ratings")
         logger.info(f"✓ Imputed {stats['yelp_ratings_imputed']} Yelp ratings")
         logger.info("")
 
@@ -516,34 +719,32 @@ def run_comprehensive_imputation(dry_run=False, include_inactive=True):
         logger.info("STEP 5: Update Combined Rating & Rating Category")
         logger.info("-" * 80)
 
+        # Combined rating = average of the available (non-zero) ratings;
+        # rounded with Python's round(), which np.round doesn't match on
+        # halves like 4.45
+        rated = []
         for clinic in all_clinics:
-            # Calculate combined rating
-            ratings = []
-            if clinic.google_rating:
-                ratings.append(clinic.google_rating)
-            if clinic.yelp_rating:
-                ratings.append(clinic.yelp_rating)
-
+            ratings = [r for r in (clinic.google_rating, clinic.yelp_rating) if r]
             if ratings:
-                new_combined = round(sum(ratings) / len(ratings), 1)
+                rated.append((clinic, round(sum(ratings) / len(ratings), 1)))
 
-                # Update combined rating if changed
-                if clinic.combined_rating != new_combined:
-                    if not dry_run:
-                        clinic.combined_rating = new_combined
+        # Rating category for every rated clinic at once
+        categories = calculate_rating_categories([new_combined for _, new_combined in rated])
 
-                # Update rating category based on combined rating
-                new_category = calculate_rating_category(new_combined)
-                if clinic.rating_category != new_category:
-                    if not dry_run:
-                        clinic.rating_category = new_category
-                    stats['rating_categories_updated'] += 1
+        # Only rows whose combined rating or category changed are written
+        for (clinic, new_combined), new_category in zip(rated, categories):
+            category_changed = clinic.rating_category != new_category
+            if category_changed:
+                stats['rating_categories_updated'] += 1
+            if (category_changed or clinic.combined_rating != new_combined) and not dry_run:
+                set_imputed(clinic, combined_rating=new_combined, rating_category=new_category)
 
         logger.info(f"✓ Updated {stats['rating_categories_updated']} rating categories")
         logger.info("")
 
-        # Commit changes
+        # Commit changes (after writing the last partial batch)
         if not dry_run:
+            flush_imputed(session, pending)
             session.commit()
             logger.success("✓ All changes committed to database")
         else:
@@ -587,6 +788,11 @@ if __name__ == '__main__':
         action='store_true',
         help='Only impute active clinics (default: impute all clinics)'
     )
+    parser.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Log every imputed value (default: first 10 per step)'
+    )
 
     args = parser.parse_args()
 
@@ -601,7 +807,8 @@ if __name__ == '__main__':
     # Run imputation
     stats = run_comprehensive_imputation(
         dry_run=args.dry_run,
-        include_inactive=not args.active_only
+        include_inactive=not args.active_only,
+        verbose=args.verbose
     )
 
     if not args.dry_run: